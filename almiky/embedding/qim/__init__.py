@@ -2,6 +2,8 @@
 
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 
 class Dither(ABC):
     '''
@@ -18,3 +20,17 @@ class Dither(ABC):
     @abstractmethod
     def __call__(index):
         '''See help(type(instance))'''
+
+    def many(self, indexes):
+        '''
+        Return dither values for an array of indexes. Dithers should
+        override this method with a vectorized version, default
+        implementation calls the dither for each index.
+
+        Args:
+            indexes (array_like): dither indexes
+
+        Returns:
+            numpy array: dither values
+        '''
+        return np.vectorize(self, otypes=[float])(indexes)
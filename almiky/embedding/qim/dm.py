@@ -12,6 +12,7 @@ import numpy as np
 
 from almiky.embedding import Embedder
 from almiky.embedding.qim import Dither
+from almiky.quantization.scalar import UniformQuantizer
 
 
 class RandomDitherValue:
@@ -77,6 +78,19 @@ class BinaryDither(Dither):
 
         return self.values[index]
 
+    def many(self, indexes):
+        '''
+        Return dither values for an array of indexes
+        using the cached dither table.
+
+        Args:
+            indexes (array_like): dither indexes (values 0 or 1)
+
+        Returns:
+            numpy array: dither values
+        '''
+        return self(np.asarray(indexes, dtype=np.intp))
+
 
 class BinaryDM(Embedder):
     '''
@@ -146,9 +160,97 @@ class BinaryDM(Embedder):
             int: watermark bit extrated (value 0 or 1)
         '''
 
+        if self.lattice() is not None:
+            return int(self.extract_many(amplitude))
+
         distances = [
             abs(self.embed(amplitude, bit) - amplitude)
             for bit in (0, 1)
         ]
 
         return np.argmin(distances)
+
+    def embed_many(self, amplitudes, bits):
+        '''
+        Embed an array of bits in an array of amplitudes and
+        return the new amplitudes. See help(self.embed).
+
+        Args:
+            amplitudes (array_like): amplitudes of signal
+            bits (array_like): bits to embed (values 0 or 1), its shape
+                must match (or be broadcastable to) amplitudes shape
+
+        Returns:
+            numpy array: new amplitudes
+        '''
+
+        bits = np.asarray(bits).astype(np.intp)
+        if np.any((bits != 0) & (bits != 1)):
+            raise ValueError('Embedding an invalid bit')
+
+        dither = self.dither.many(bits)
+
+        return self.quantizer.quantize_many(amplitudes + dither) - dither
+
+    def lattice(self):
+        '''
+        Return (step, offset) of the lattice formed by the union of
+        d0 and d1 cosets, reconstruction points are step * m - offset
+        where even m correspond to bit 0 and odd m to bit 1.
+
+        Return None if the lattice is unknown: quantizer is not an
+        UniformQuantizer or dither is not a BinaryDither with the
+        same quantization step.
+        '''
+
+        if not isinstance(self.quantizer, UniformQuantizer):
+            return None
+        if not isinstance(self.dither, BinaryDither):
+            return None
+        if self.quantizer.step != self.dither.step:
+            return None
+
+        return self.dither.step / 2, self.dither(0)
+
+    def extract_many(self, amplitudes, margin=False):
+        '''
+        Extract a bit from each amplitude of an array using a
+        minimum distance decoder. See help(self.extract).
+
+        When the lattice of both cosets is known (see help(self.lattice))
+        bits are decoded in one pass without re-embedding.
+
+        Args:
+            amplitudes (array_like): amplitudes of signal
+            margin (bool): return too the distance margin between the
+                nearest reconstruction point of each coset, it can be
+                used as a soft confidence value (default is False)
+
+        Returns:
+            numpy array: watermark bits extrated (values 0 or 1)
+            numpy array: distance margins (only if margin is True)
+        '''
+
+        amplitudes = np.asarray(amplitudes, dtype=float)
+        lattice = self.lattice()
+
+        if lattice is None:
+            distances = [
+                np.abs(self.embed_many(amplitudes, bit) - amplitudes)
+                for bit in (0, 1)
+            ]
+            # Equal distances are decoded as zero (as np.argmin does)
+            bits = (distances[1] < distances[0]).astype(np.uint8)
+            margins = np.abs(distances[0] - distances[1])
+        else:
+            step, offset = lattice
+            position = (amplitudes + offset) / step
+            # Ties are rounded to even points, so they are decoded as zero
+            nearest = np.rint(position)
+            bits = np.mod(nearest, 2).astype(np.uint8)
+            margins = (1 - 2 * np.abs(position - nearest)) * step
+
+        if margin:
+            return bits, margins
+
+        return bits
@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+import numpy as np
+
 from almiky.embedding.qim import Dither
 
 
@@ -9,3 +11,12 @@ class DitherInterfaceTest(TestCase):
     def test(self):
         with self.assertRaises(TypeError):
             Dither()
+
+    def test_many(self):
+        class IndexDither(Dither):
+            def __call__(self, index):
+                return index * 2.5
+
+        dither = IndexDither()
+
+        np.testing.assert_array_equal(dither.many([0, 1, 1]), [0, 2.5, 2.5])
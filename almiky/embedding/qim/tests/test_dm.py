@@ -4,6 +4,8 @@ import random
 from unittest import TestCase
 from unittest.mock import call, MagicMock, Mock
 
+import numpy as np
+
 from almiky.embedding.qim import dm
 from almiky.quantization.scalar import UniformQuantizer
 
@@ -48,6 +50,11 @@ class BinaryDMDitherTest(TestCase):
         self.assertEqual(d(0), 0)
         self.assertEqual(d(1), -6)
 
+    def test_many(self):
+        d = dm.BinaryDither(step=12, d0=3)
+
+        np.testing.assert_array_equal(d.many([0, 1, 1, 0]), [3, -3, -3, 3])
+
 
 class BinaryDMEmbedTest(TestCase):
 
@@ -192,3 +199,97 @@ class RandomDitherValueTest(TestCase):
         value = dm.RandomDitherValue(12)
 
         self.assertLessEqual(abs(value), 6)
+
+
+class BinaryDMManyTest(TestCase):
+    '''Test array level embedding and extraction'''
+
+    def test_embed_many(self):
+        step = 12
+        d0 = random.uniform(-6, 6)
+        amplitudes = np.random.rand(50) * 200 - 100
+        bits = np.random.randint(0, 2, 50)
+
+        quantizer = UniformQuantizer(step)
+        dither = dm.BinaryDither(step, d0)
+        emb = dm.BinaryDM(quantizer, dither)
+
+        np.testing.assert_array_almost_equal(
+            emb.embed_many(amplitudes, bits),
+            [emb.embed(x, bit) for x, bit in zip(amplitudes, bits)]
+        )
+
+    def test_embed_many_non_binary_data(self):
+        quantizer = UniformQuantizer(12)
+        dither = dm.BinaryDither(12, 3)
+        emb = dm.BinaryDM(quantizer, dither)
+
+        with self.assertRaises(ValueError):
+            emb.embed_many(np.array([10, 20]), np.array([0, 5]))
+
+    def test_extract_many(self):
+        step = 6
+        d0 = random.uniform(-3, 3)
+        amplitudes = np.random.rand(50) * 200 - 100
+        bits = np.random.randint(0, 2, 50)
+        noise = (np.random.rand(50) - 0.5) * step / 2
+
+        quantizer = UniformQuantizer(step)
+        dither = dm.BinaryDither(step, d0)
+        emb = dm.BinaryDM(quantizer, dither)
+
+        ws = emb.embed_many(amplitudes, bits) + noise
+
+        extracted = emb.extract_many(ws)
+        np.testing.assert_array_equal(extracted, bits)
+        np.testing.assert_array_equal(
+            extracted, [emb.extract(y) for y in ws])
+
+
+class BinaryDMMinimumDistanceTest(TestCase):
+    '''Test closed form decoder'''
+
+    def test_lattice(self):
+        emb = dm.BinaryDM(UniformQuantizer(12), dm.BinaryDither(12, -2))
+        self.assertEqual(emb.lattice(), (6, -2))
+
+        # Unknown lattice
+        emb = dm.BinaryDM(MagicMock(), MagicMock())
+        self.assertIsNone(emb.lattice())
+
+        emb = dm.BinaryDM(UniformQuantizer(10), dm.BinaryDither(12, -2))
+        self.assertIsNone(emb.lattice())
+
+    def test_same_bits_as_reembedding(self):
+        step = 12
+        d0 = random.uniform(-6, 6)
+        amplitudes = np.random.rand(200) * 200 - 100
+
+        emb = dm.BinaryDM(UniformQuantizer(step), dm.BinaryDither(step, d0))
+        distances = [
+            np.abs(emb.embed_many(amplitudes, bit) - amplitudes)
+            for bit in (0, 1)
+        ]
+
+        bits, margins = emb.extract_many(amplitudes, margin=True)
+
+        np.testing.assert_array_equal(bits, np.argmin(distances, axis=0))
+        np.testing.assert_array_almost_equal(
+            margins, np.abs(distances[0] - distances[1]))
+
+    def test_margin(self):
+        emb = dm.BinaryDM(UniformQuantizer(12), dm.BinaryDither(12, 3))
+        # Reconstruction points: bit 0 => 9, 21, ...; bit 1 => 3, 15, ...
+
+        bits, margins = emb.extract_many([9, 10, 12, 14, 15], margin=True)
+
+        np.testing.assert_array_equal(bits, [0, 0, 0, 1, 1])
+        np.testing.assert_array_almost_equal(margins, [6, 4, 0, 4, 6])
+
+    def test_scalar_extract_without_reembedding(self):
+        emb = dm.BinaryDM(UniformQuantizer(12), dm.BinaryDither(12, 3))
+        emb.embed = Mock()
+
+        self.assertEqual(emb.extract(14.5), 1)
+        self.assertEqual(emb.extract(10), 0)
+        emb.embed.assert_not_called()
@@ -58,6 +58,48 @@ class SingleBitHider:
         amplitude = scanning[index]
         return self.embedder.extract(amplitude)
 
+    @property
+    def batched(self):
+        '''
+        True if embedder can embed and extract arrays of bits,
+        then insert_many and extract_many can be used.
+        '''
+        embedder_class = type(self.embedder)
+        return (
+            hasattr(embedder_class, 'embed_many') and
+            hasattr(embedder_class, 'extract_many')
+        )
+
+    def insert_many(self, cover_works, bits, index=0):
+        '''
+        Hide a bit in each work of a stack at once
+
+        Args:
+            cover_works (numpy array): cover works with shape (n, N, N)
+            bits (array_like): n bits to hide
+            index (int): index of coefficient where bits will be hidden
+        '''
+        data = np.array(cover_works)
+        amplitudes = self.scan.gather(data, index)
+        self.scan.scatter(
+            data, self.embedder.embed_many(amplitudes, bits), index)
+
+        return data
+
+    def extract_many(self, ws_works, index=0):
+        '''
+        Get the bit hidden in each work of a stack and
+        return them as a numpy array
+
+        Args:
+            ws_works (numpy array): watermarked or stego works
+                with shape (n, N, N)
+            index (int): index of coefficient where bits will be extracted
+                (default is 0)
+        '''
+        amplitudes = self.scan.gather(np.asarray(ws_works), index)
+        return self.embedder.extract_many(amplitudes)
+
 
 class TransformHider:
     '''
@@ -103,3 +145,34 @@ class TransformHider:
         direct = self.transform.direct(ws_work)
 
         return self.hider.extract(direct, **kwargs)
+
+    @property
+    def batched(self):
+        '''
+        True if base hider and transform work on stacks of works,
+        then insert_many and extract_many can be used.
+        '''
+        return (
+            getattr(self.hider, 'batched', False) is True and
+            hasattr(type(self.transform), 'direct_blocks') and
+            hasattr(type(self.transform), 'inverse_blocks')
+        )
+
+    def insert_many(self, cover_works, data, **kwargs):
+        '''
+        Insert the payload in transform domain of a stack
+        of works using base hider.
+        '''
+        direct = self.transform.direct_blocks(cover_works)
+        ws_works = self.hider.insert_many(direct, data, **kwargs)
+
+        return self.transform.inverse_blocks(ws_works)
+
+    def extract_many(self, ws_works, **kwargs):
+        '''
+        Extract payload from transform domain of a stack
+        of works using base hider.
+        '''
+        direct = self.transform.direct_blocks(ws_works)
+
+        return self.hider.extract_many(direct, **kwargs)
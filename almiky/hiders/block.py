@@ -5,6 +5,7 @@ Basic hiders
 import numpy as np
 
 from almiky.utils.blocks import BlocksImage
+from almiky.utils.payload import as_bits
 
 
 class BlockHider:
@@ -66,15 +67,30 @@ class BlockBitHider(BlockHider):
         Hide a bit
 
         Arguments:
-        bit -- bit to hide
+        msg -- bits to hide: a Payload, str of '0' and '1' characters
+            or iterable of bits (see help(Payload))
         index -- index of coefficient where bit will be hidden
+
+        When the hider supports batched operations (see
+        help(TransformHider.batched)) all blocks are processed at once.
         '''
         data = np.copy(cover)
         blocks = BlocksImage(data, *block_shape)
-
-        for i in range(len(msg)):
+        # Bits are unpacked once (indexing a Payload unpacks it)
+        bits = as_bits(msg)
+
+        if getattr(self.hider, 'batched', False) is True:
+            if len(bits) > len(blocks):
+                raise ValueError("Capacity exceded.")
+            indexes = np.arange(len(bits))
+            ws_blocks = self.hider.insert_many(
+                blocks.get_many(indexes), bits, **kwargs)
+            blocks.set_many(indexes, ws_blocks)
+            return data
+
+        for i, bit in enumerate(bits):
             try:
-                blocks[i] = self.hider.insert(blocks[i], msg[i], **kwargs)
+                blocks[i] = self.hider.insert(blocks[i], bit, **kwargs)
             except IndexError as e:
                 raise ValueError("Capacity exceded.") from e
 
@@ -82,16 +98,20 @@ class BlockBitHider(BlockHider):
 
     def extract(self, ws_work, block_shape=(8, 8), **kwargs):
         '''
-        Get bit hidden an return it
+        Get bits hidden and return them as a numpy array of uint8,
+        one bit per block.
 
         Arguments:
         index -- index of coefficient where bit will be extracted
         '''
-        msg = ''
         blocks = BlocksImage(ws_work, *block_shape)
 
-        for block in blocks:
-            bit = self.hider.extract(block, **kwargs)
-            msg += str(bit)
+        if getattr(self.hider, 'batched', False) is True:
+            indexes = np.arange(len(blocks))
+            bits = self.hider.extract_many(blocks.get_many(indexes), **kwargs)
+            return np.asarray(bits, dtype=np.uint8)
 
-        return msg
+        return np.array(
+            [self.hider.extract(block, **kwargs) for block in blocks],
+            dtype=np.uint8
+        )
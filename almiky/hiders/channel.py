@@ -0,0 +1,133 @@
+'''
+Hiders for colour images
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from almiky.utils import color
+from almiky.utils.payload import as_bits
+
+
+class ChannelHider:
+    '''
+    Hide payload in several planes of a colour image using a plane
+    hider, for example a BlockBitHider or HidderEightFrequencyCoeficients:
+    hider = ChannelHider(BlockBitHider(...))
+
+    Payload bits are interleaved among channels: bit i is hidden in
+    channel i % len(channels), so capacity is the plane capacity times
+    the number of channels.
+
+    Planes can be RGB (default) or YCbCr (JPEG/JFIF) components:
+    hider = ChannelHider(plane_hider, color_space='ycbcr')
+
+    and they can be processed in a pool of threads (numpy transforms
+    release the GIL):
+    hider = ChannelHider(plane_hider, workers=3)
+
+    Additional arguments of insert and extract are passed
+    to plane hider.
+    '''
+
+    color_spaces = ('rgb', 'ycbcr')
+
+    def __init__(self, hider, channels=(0, 1, 2), color_space='rgb',
+                 workers=None):
+        '''
+        Initialize self. See help(type(self)) for accurate signature.
+
+        Arguments:
+        hider -- plane hider
+        channels -- channels where payload is hidden (default is all)
+        color_space -- 'rgb' or 'ycbcr' (default is 'rgb')
+        workers -- number of threads, None or 1 to process channels
+            sequentially (default is None)
+        '''
+        if color_space not in self.color_spaces:
+            raise ValueError('Invalid color space')
+
+        self.hider = hider
+        self.channels = tuple(channels)
+        self.color_space = color_space
+        self.workers = workers
+
+    def _map(self, function, *iterables):
+        '''
+        Return results of function applied to each channel
+        '''
+        if self.workers is None or self.workers <= 1:
+            return list(map(function, *iterables))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(function, *iterables))
+
+    def _planes(self, work):
+        '''
+        Return work in hider color space, as a float array
+        (integer planes would truncate transformed blocks)
+        '''
+        if self.color_space == 'ycbcr':
+            return color.rgb2ycbcr(work)
+
+        if np.issubdtype(work.dtype, np.integer):
+            return work.astype(np.float64)
+        return work
+
+    def insert(self, cover, msg, **kwargs):
+        '''
+        Hide a payload in a colour image and return
+        the watermarked/stego work.
+
+        Arguments:
+        cover -- cover work with shape (rows, cols, channels)
+        msg -- payload: a Payload, str of '0' and '1' characters
+            or iterable of bits
+
+        Planes are processed as floats. YCbCr works are converted back
+        to RGB; integer works are rounded and clipped to the range of
+        their dtype.
+        '''
+        bits = as_bits(msg)
+        planes = self._planes(cover)
+        channels = len(self.channels)
+
+        def insert(channel, index):
+            return self.hider.insert(
+                planes[:, :, channel], bits[index::channels], **kwargs)
+
+        ws_planes = self._map(insert, self.channels, range(channels))
+
+        ws_work = np.array(planes, copy=True)
+        for channel, plane in zip(self.channels, ws_planes):
+            ws_work[:, :, channel] = plane
+
+        if self.color_space == 'ycbcr':
+            ws_work = color.ycbcr2rgb(ws_work)
+        if np.issubdtype(cover.dtype, np.integer):
+            limits = np.iinfo(cover.dtype)
+            ws_work = np.clip(np.rint(ws_work), limits.min, limits.max)
+
+        return ws_work.astype(cover.dtype)
+
+    def extract(self, ws_work, **kwargs):
+        '''
+        Extract the payload from a colour image and return it as
+        an array of uint8 bits.
+
+        Arguments:
+        ws_work -- watermarked/stego work with shape
+            (rows, cols, channels)
+        '''
+        planes = self._planes(ws_work)
+        extract = getattr(self.hider, 'extract_bits', self.hider.extract)
+
+        def extract_plane(channel):
+            return as_bits(extract(planes[:, :, channel], **kwargs))
+
+        channel_bits = self._map(extract_plane, self.channels)
+
+        length = min(len(bits) for bits in channel_bits)
+        return np.stack(
+            [bits[:length] for bits in channel_bits], axis=1).reshape(-1)
@@ -5,9 +5,74 @@ Data hidding methods for digital images
 import numpy as np
 from almiky.utils import utils
 from almiky.utils.blocks import BlocksImage
+from almiky.utils.payload import as_bits
+from almiky.utils.scan import maps
+from almiky.utils.scan.scan import ScanMapping
 from almiky.exceptions import ExceededCapacity
 
 
+def _direct_blocks(transform, blocks):
+    '''
+    Return direct transform of a stack of blocks (n, 8, 8)
+    '''
+    if hasattr(type(transform), 'direct_blocks'):
+        return transform.direct_blocks(blocks)
+
+    return np.array([transform.direct(block) for block in blocks])
+
+
+def _inverse_blocks(transform, blocks):
+    '''
+    Return inverse transform of a stack of blocks (n, 8, 8)
+    '''
+    if hasattr(type(transform), 'inverse_blocks'):
+        return transform.inverse_blocks(blocks)
+
+    return np.array([transform.inverse(block) for block in blocks])
+
+
+def _message_bits(msg):
+    '''
+    Return bits of a message: text is coded with utils.char2bin,
+    other messages (Payload, bit arrays) are taken as bits.
+    '''
+    if isinstance(msg, str):
+        return as_bits(utils.char2bin(msg))
+
+    return as_bits(msg)
+
+
+def _text(bits):
+    '''
+    Return text from bits, array version of utils.bin2char
+    '''
+    complete = len(bits) - len(bits) % 8
+    text = np.packbits(bits[:complete]).tobytes().decode('latin-1')
+    if complete < len(bits):
+        text += chr(int(''.join(str(bit) for bit in bits[complete:]), 2))
+
+    return text
+
+
+def _replace_lsb(coefficients, bits):
+    '''
+    Return coefficients rounded with least significant bit of
+    their magnitude replaced by bits, sign is kept.
+    Array version of np.sign(c) * utils.replace(abs(round(c)), bit)
+    '''
+    magnitudes = np.abs(np.rint(coefficients)).astype(np.int64)
+    return np.sign(coefficients) * ((magnitudes & ~1) | bits)
+
+
+def _lsb(coefficients):
+    '''
+    Return least significant bit of rounded coefficients magnitude.
+    Array version of utils.ext_lsb(abs(round(c)))
+    '''
+    magnitudes = np.abs(np.rint(coefficients)).astype(np.int64)
+    return (magnitudes & 1).astype(np.uint8)
+
+
 class HidderFrequency:
     """
     Image is divided in 8x8 blocks and each block is transformed to
@@ -46,116 +111,138 @@ class HidderEightFrequencyCoeficients():
     def __verify_msg__(self, msg):
         pass
 
+    # Coefficients 2-9 in zig-zag order
+    scan = ScanMapping(maps.ZIGZAG_8x8)
+    coefficients = slice(1, 9)
+
+    def _blocks(self, array):
+        '''
+        Return blocks of image (red component in colour images)
+        '''
+        if len(array.shape) == 2:
+            return BlocksImage(array)
+        # Red component
+        return BlocksImage(array[:, :, 0])
+
     def insert(self, cover_array, msg=None):
         '''
         obj.insert(cover_array, msg) => (np.numpy): Return a watermarked
-        work (stego work) with specified message.
+        work (stego work) with specified message. (msg) is a text, a
+        Payload or an array of bits.
+
+        All blocks are transformed at once.
         '''
-        # Initial Values
-        count = 0
-        # Binary message
-        bin_msg = utils.char2bin(msg)
-        # Creating copy
+        bin_msg = _message_bits(msg)
         watermarked_array = np.copy(cover_array)
-        # Depth of the image
-        if len(watermarked_array.shape) == 2:
-            red_watermarked_array = watermarked_array
-        else:
-            # Red component
-            red_watermarked_array = watermarked_array[:, :, 0]
-        # Instance
-        block_instace_8x8 = BlocksImage(red_watermarked_array)
-        # Increasing the hash function
-        # self.hashf = increase(self.hashf, block_instace_8x8.max_num_blocks())
+        blocks = self._blocks(watermarked_array)
+
         # Checking the embedding capacity
-        embd_cap = block_instace_8x8.max_num_blocks() * 8
+        embd_cap = blocks.max_num_blocks() * 8
         if len(bin_msg) > embd_cap:
             raise ExceededCapacity
 
-        for i in range(block_instace_8x8.max_num_blocks()):
-            block8x8 = block_instace_8x8[i]
-            block_transf8x8 = self.ortho_matrix.direct(block8x8)
-            vac = utils.vzig_zag_scan(block_transf8x8)
-            for k in range(1, 9):
-                # TODO: l deleted
-                # vac[k] = np.sign(vac[k]) * utils.replace(
-                #     abs(round(vac[k])), bin_msg[i % (len(bin_msg))]
-                # )
-                if count < len(bin_msg):
-                    vac[k] = np.sign(vac[k]) * utils.replace(
-                        abs(round(vac[k])), bin_msg[count]
-                    )
-                    count += 1
-            block_transf8x8 = utils.mzig_zag_scan(vac)
-            block_instace_8x8[i] = self.ortho_matrix.inverse(block_transf8x8)
+        indexes = np.arange(blocks.max_num_blocks())
+        transformed = _direct_blocks(
+            self.ortho_matrix, blocks.get_many(indexes))
+
+        # Bits are inserted block by block, in zig-zag order
+        coefficients = self.scan.gather(transformed, self.coefficients)
+        flat = coefficients.reshape(-1)
+        flat[:len(bin_msg)] = _replace_lsb(flat[:len(bin_msg)], bin_msg)
+        self.scan.scatter(
+            transformed, flat.reshape(coefficients.shape), self.coefficients)
+
+        blocks.set_many(
+            indexes, _inverse_blocks(self.ortho_matrix, transformed))
 
         return watermarked_array
 
+    def extract_bits(self, ws_array):
+        '''
+        obj.extract_bits(watermarked_array) => (np.numpy): Return bits
+        hidden in all blocks as an uint8 array.
+        '''
+        blocks = self._blocks(ws_array)
+        indexes = np.arange(blocks.max_num_blocks())
+        transformed = _direct_blocks(
+            self.ortho_matrix, blocks.get_many(indexes))
+        coefficients = self.scan.gather(transformed, self.coefficients)
+
+        return _lsb(coefficients).reshape(-1)
+
     def extract(self, ws_array, msg=None):
         '''
         obj.get(watermarked_array) => (np.numpy): Return the message.
         '''
-        extracted_lsb = ''
-        # Depth of the image
-        if len(ws_array.shape) == 2:
-            red_ws_array = ws_array
-        else:
-            # Red component
-            red_ws_array = ws_array[:, :, 0]
-        # Instance
-        block_instace_8x8 = BlocksImage(red_ws_array)
-        # Extraction process
-        for i in range(block_instace_8x8.max_num_blocks()):
-            block8x8 = block_instace_8x8[i]
-            block_transf8x8 = self.ortho_matrix.direct(block8x8)
-            vac = utils.vzig_zag_scan(block_transf8x8)
-            for k in range(1, 9):
-                extracted_lsb += utils.ext_lsb(abs(round(vac[k])))
-        return utils.bin2char(extracted_lsb)
+        return _text(self.extract_bits(ws_array))
 
 
 class HidderFrequencyLeastSignificantBit(HidderFrequency):
-    def __insert__(self, bit, block, index):
-        block_transf8x8 = self.ortho_matrix.direct(block)
-        coeficients = block_transf8x8.reshape(-1)
-        coeficients[index] = (
-            np.sign(coeficients[index]) *
-            utils.replace(abs(round(coeficients[index])), bit)
-        )
-        return block_transf8x8
-
-    def __extract__(self, block, index):
-        block = self.ortho_matrix.direct(block)
-        coeficient = block.reshape(-1)[index]
-        return utils.ext_lsb(coeficient)
+    """
+    Image is divided in 8x8 blocks and each block is transformed to
+    frequency domain. One bit of message is inserted in least
+    significant bit of one coefficient of each block.
+
+    Blocks carrying the message are transformed at once.
+    """
 
     def insert(self, cover_array, msg, coeficient_index):
-        # Binary data
-        bin_msg = utils.char2bin(msg)
-        # Cover copy and block generation
+        '''
+        obj.insert(cover_array, msg, coeficient_index) => (np.numpy):
+        Return a watermarked work (stego work) with specified message
+        hidden in the coefficient (coeficient_index, row major order)
+        of the first len(msg) blocks. (msg) is a text, a Payload or an
+        array of bits.
+        '''
+        bin_msg = _message_bits(msg)
         watermarked_array = np.copy(cover_array)
-        block_instance_8x8 = BlocksImage(watermarked_array)
+        blocks = BlocksImage(watermarked_array)
 
         # Checking the embedding capacity
-        embd_cap = block_instance_8x8.max_num_blocks()
+        embd_cap = blocks.max_num_blocks()
         self.validate_capacity(bin_msg, embd_cap)
+        if not len(bin_msg):
+            return watermarked_array
+
+        indexes = np.arange(len(bin_msg))
+        transformed = _direct_blocks(
+            self.ortho_matrix, blocks.get_many(indexes))
+        coefficients = transformed.reshape(len(bin_msg), -1)
+        coefficients[:, coeficient_index] = _replace_lsb(
+            coefficients[:, coeficient_index], bin_msg)
 
-        # insertion process
-        for index, bit in enumerate(bin_msg):
-            block8x8 = block_instance_8x8.get_block(index)
-            block_transf8x8 = self.__insert__(bit, block8x8, coeficient_index)
-            block_instance_8x8.set_block(
-                self.ortho_matrix.inverse(block_transf8x8), index)
+        blocks.set_many(
+            indexes, _inverse_blocks(self.ortho_matrix, transformed))
 
         return watermarked_array
 
-    def extract(self, watermarked_array, coeficient_index):
-        msg = ''
-        block_manager = BlocksImage(watermarked_array)
-        for block in range(block_manager.max_num_blocks()):
-            msg += self.__extract__(block, coeficient_index)
+    def extract_bits(self, watermarked_array, coeficient_index, length=None):
+        '''
+        obj.extract_bits(watermarked_array, coeficient_index, length)
+        => (np.numpy): Return bits hidden in the first (length) blocks
+        (default is all blocks) as an uint8 array.
+        '''
+        blocks = BlocksImage(watermarked_array)
+        number = blocks.max_num_blocks()
+        if length is not None:
+            number = min(length, number)
+        if not number:
+            return np.zeros(0, dtype=np.uint8)
+
+        transformed = _direct_blocks(
+            self.ortho_matrix, blocks.get_many(np.arange(number)))
+
+        return _lsb(transformed.reshape(number, -1)[:, coeficient_index])
+
+    def extract(self, watermarked_array, coeficient_index, length=None):
+        '''
+        obj.extract(watermarked_array, coeficient_index, length) => str:
+        Return the message hidden in the first (length) blocks
+        (default is all blocks).
+        '''
+        bits = self.extract_bits(watermarked_array, coeficient_index, length)
 
-        return utils.bin2char(msg)
+        return _text(bits)
 
 
 class BlockHider:
@@ -0,0 +1,299 @@
+'''
+Embed a payload in all images of a folder using a pool of processes.
+
+Usage:
+almiky-embed covers/ -o stego/ --text 'almiky' --transform tchebichef \
+    --step 10 --d0 -2.5 --scan zigzag --index 4 --workers 8
+
+Images are written to the output folder as PNG files (lossless), named
+after the whole source file name (covers/a.jpg => stego/a.jpg.png), and a
+CSV report with PSNR and BER of each image is written to stdout or to
+--report file. Stego images keep the integer dtype of their covers
+(16 bit covers are saved as 16 bit PNG files).
+
+Invalid hider or payload options (e.g. --d0 out of [-step/2, step/2])
+are rejected before any image is processed.
+'''
+
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import csv
+import os
+from pathlib import Path
+import sys
+
+import imageio
+import numpy as np
+from scipy import fft
+
+from almiky.embedding.qim.dm import BinaryDM, BinaryDither
+from almiky.hiders.base import SingleBitHider, TransformHider
+from almiky.hiders.block import BlockBitHider
+from almiky.hiders.channel import ChannelHider
+from almiky.metrics.imperceptibility import psnr
+from almiky.metrics.robustness import ber
+from almiky.moments import transform as moments
+from almiky.moments.matrix import TchebichefMatrix, Transform
+from almiky.quantization.scalar import UniformQuantizer
+from almiky.utils.payload import Payload
+from almiky.utils.scan import maps
+from almiky.utils.scan.scan import ScanMapping
+
+
+def dct_matrix(size):
+    '''
+    Return the orthonormal DCT-II matrix, basis functions in columns
+    '''
+    return fft.dct(np.identity(size), norm='ortho', axis=0).T
+
+
+def tchebichef_matrix(size):
+    '''
+    Return the Tchebichef moments matrix
+    '''
+    return TchebichefMatrix(size, N=size).transform.l_orthon_matrix
+
+
+TRANSFORMS = {
+    'dct': dct_matrix,
+    'tchebichef': tchebichef_matrix,
+}
+# 8x8 moments matrices
+TRANSFORMS.update({
+    name.lower(): getattr(moments, name)
+    for name in (
+        'KRAWTCHOUK', 'HAHN', 'CHARLIER', 'MEIXNER', 'QKRAWTCHOUK',
+        'QHAHN', 'QCHARLIER', 'QMEIXNER')
+})
+
+SCANS = {
+    'row-major': maps.ROW_MAJOR_8x8,
+    'zigzag': maps.ZIGZAG_8x8,
+}
+
+REPORT_FIELDS = ('image', 'output', 'bits', 'psnr', 'ber', 'error')
+
+
+def build_hider(config):
+    '''
+    Return the hider described by config (see help(main))
+    '''
+    build = TRANSFORMS[config.transform]
+    if callable(build):
+        matrix = build(config.block_size)
+    elif config.block_size == len(build):
+        matrix = build
+    else:
+        raise ValueError(
+            '{} transform is only available for 8x8 blocks'.format(
+                config.transform))
+
+    scan_map = SCANS[config.scan]
+    if config.block_size != 8:
+        scan_map = list(range(config.block_size ** 2))
+
+    embedder = BinaryDM(
+        UniformQuantizer(config.step), BinaryDither(config.step, config.d0))
+    hider = BlockBitHider(TransformHider(
+        SingleBitHider(ScanMapping(scan_map), embedder), Transform(matrix)))
+
+    return hider, ChannelHider(hider)
+
+
+def load_payload(config):
+    '''
+    Return the payload described by config (see help(main))
+    '''
+    if config.payload is not None:
+        return Payload.from_bytes(Path(config.payload).read_bytes())
+    if config.text is not None:
+        return Payload.from_text(config.text)
+
+    random = np.random.default_rng(config.seed)
+    return Payload.from_bits(random.integers(0, 2, config.random_bits))
+
+
+def embed(path, outdir, payload, hiders, config):
+    '''
+    Embed payload in an image, save the stego image and
+    return its report row.
+    '''
+    plane_hider, channel_hider = hiders
+    kwargs = {
+        'index': config.index,
+        'block_shape': (config.block_size, config.block_size)
+    }
+    # Source suffix is kept so a.jpg and a.bmp are not both saved as a.png
+    output = outdir.joinpath(path.name + '.png')
+
+    cover = imageio.imread(str(path))
+    hider = plane_hider if cover.ndim == 2 else channel_hider
+    bits = payload.bits()
+
+    ws_work = hider.insert(cover.astype(float), bits, **kwargs)
+    # Integer covers (e.g. 16 bit PNG) keep their dtype, others are
+    # saved as 8 bit images
+    dtype = cover.dtype if np.issubdtype(cover.dtype, np.integer) \
+        else np.dtype(np.uint8)
+    limits = np.iinfo(dtype)
+    ws_work = np.clip(np.rint(ws_work), limits.min, limits.max).astype(dtype)
+    imageio.imwrite(str(output), ws_work)
+
+    extracted = hider.extract(ws_work.astype(float), **kwargs)
+
+    return {
+        'image': path.name,
+        'output': output.name,
+        'bits': len(bits),
+        'psnr': psnr(cover, ws_work, max=limits.max),
+        'ber': ber(bits, extracted[:len(bits)]),
+        'error': '',
+    }
+
+
+def process(paths, outdir, config):
+    '''
+    Process a chunk of images and return their report rows,
+    failures are reported too.
+    '''
+    payload = load_payload(config)
+    hiders = build_hider(config)
+    rows = []
+
+    for path in paths:
+        try:
+            rows.append(embed(path, outdir, payload, hiders, config))
+        except Exception as e:
+            rows.append({
+                'image': path.name, 'output': '', 'bits': len(payload),
+                'psnr': '', 'ber': '', 'error': repr(e)})
+
+    return rows
+
+
+def chunks(items, size):
+    '''
+    Yield lists of size items
+    '''
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def run(config, report):
+    '''
+    Embed payload in all images of config.indir using a pool of
+    processes and write report rows as soon as chunks are completed.
+    Return number of failed images.
+    '''
+    indir = Path(config.indir)
+    outdir = Path(config.output)
+    outdir.mkdir(parents=True, exist_ok=True)
+    paths = sorted(path for path in indir.iterdir() if path.is_file())
+
+    writer = csv.DictWriter(report, fieldnames=REPORT_FIELDS)
+    writer.writeheader()
+    failures = 0
+
+    workers = config.workers or os.cpu_count() or 1
+    # Only a bounded number of chunks are submitted at once
+    limit = 2 * workers
+    pending = set()
+    tasks = chunks(paths, config.chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            for paths_chunk in tasks:
+                pending.add(
+                    executor.submit(process, paths_chunk, outdir, config))
+                if len(pending) >= limit:
+                    break
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for row in future.result():
+                    failures += bool(row['error'])
+                    writer.writerow(row)
+            report.flush()
+
+    return failures
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(
+        description='Embed a payload in all images of a folder'
+    )
+    parser.add_argument("indir", metavar="indir", help="Cover images directory")
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="Directory where stego images will be saved")
+
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--payload", help="File with payload bytes")
+    source.add_argument("--text", help="Payload text")
+    source.add_argument(
+        "--random-bits", type=int, help="Number of random payload bits")
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of random payload")
+
+    parser.add_argument(
+        "-t",
+        "--transform",
+        choices=sorted(TRANSFORMS),
+        default='tchebichef',
+        help="Block transform")
+    parser.add_argument(
+        "--step", type=float, default=10, help="Quantization step")
+    parser.add_argument(
+        "--d0", type=float, default=None,
+        help="Dither of bit 0 (default is -step / 4)")
+    parser.add_argument(
+        "--scan",
+        choices=sorted(SCANS),
+        default='zigzag',
+        help="Scan map of 8x8 blocks (row major for other sizes)")
+    parser.add_argument(
+        "--index", type=int, default=4,
+        help="Index of coefficient, in scan order, where bits are hidden")
+    parser.add_argument(
+        "--block-size", type=int, default=8, help="Block size")
+
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None,
+        help="Number of processes (default is number of CPUs)")
+    parser.add_argument(
+        "--chunk-size", type=int, default=16,
+        help="Number of images processed by each task")
+    parser.add_argument("-r", "--report", help="CSV report file")
+
+    config = parser.parse_args(args)
+    if config.d0 is None:
+        config.d0 = -config.step / 4
+
+    # Configuration errors are reported once, not by each process
+    try:
+        build_hider(config)
+        load_payload(config)
+    except Exception as e:
+        parser.error('invalid configuration: {!r}'.format(e))
+
+    return config
+
+
+def main():
+    config = parse_args()
+
+    if config.report is None:
+        failures = run(config, sys.stdout)
+    else:
+        with open(config.report, 'w', newline='') as report:
+            failures = run(config, report)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -56,6 +56,37 @@ class SingleBitHidderTest(TestCase):
 
         self.assertEqual(amplitude, .52259635)
 
+    def test_insert_many(self):
+        embedder = Mock()
+        embedder.embed_many = Mock(side_effect=lambda a, b: a + b)
+
+        cover_works = np.random.rand(3, 2, 2)
+        expected = np.copy(cover_works)
+        expected[:, 1, 0] += [1, 0, 1]
+
+        hider = hiders.SingleBitHider(ScanMapping(), embedder)
+        ws_works = hider.insert_many(cover_works, [1, 0, 1], index=2)
+
+        np.testing.assert_array_equal(ws_works, expected)
+
+    def test_extract_many(self):
+        embedder = Mock()
+        embedder.extract_many = Mock(side_effect=lambda a: a * 2)
+
+        ws_works = np.random.rand(3, 2, 2)
+
+        hider = hiders.SingleBitHider(ScanMapping(), embedder)
+        bits = hider.extract_many(ws_works, index=1)
+
+        np.testing.assert_array_equal(bits, ws_works[:, 0, 1] * 2)
+
+    def test_batched(self):
+        from almiky.embedding.qim.dm import BinaryDM
+
+        embedder = BinaryDM(Mock(), Mock())
+        self.assertTrue(hiders.SingleBitHider(ScanMapping(), embedder).batched)
+        self.assertFalse(hiders.SingleBitHider(ScanMapping(), Mock()).batched)
+
 
 class TranformHiderTest(TestCase):
 
@@ -118,6 +149,45 @@ class TranformHiderTest(TestCase):
 
         np.testing.assert_array_equal(msg, msg_expected)
 
+    def test_insert_many(self):
+        cover_works = np.random.rand(3, 2, 2)
+
+        base_hider = Mock()
+        base_hider.insert_many = Mock(side_effect=lambda w, d: w * 2)
+
+        transform = Mock()
+        transform.direct_blocks = Mock(side_effect=lambda w: w * 3)
+        transform.inverse_blocks = Mock(side_effect=lambda w: w * -1)
+
+        hider = hiders.TransformHider(base_hider, transform=transform)
+        ws_works = hider.insert_many(cover_works, [1, 0, 1])
+
+        np.testing.assert_array_equal(ws_works, cover_works * -6)
+
+    def test_extract_many(self):
+        ws_works = np.random.rand(3, 2, 2)
+
+        base_hider = Mock()
+        base_hider.extract_many = Mock(side_effect=lambda w: w.sum(axis=2))
+
+        transform = Mock()
+        transform.direct_blocks = Mock(side_effect=lambda w: w * 3)
+
+        hider = hiders.TransformHider(base_hider, transform=transform)
+        msg = hider.extract_many(ws_works)
+
+        np.testing.assert_array_almost_equal(msg, ws_works.sum(axis=2) * 3)
+
+    def test_batched(self):
+        from almiky.moments.matrix import Transform
+
+        batched_hider = Mock(batched=True)
+        transform = Transform(np.identity(2))
+
+        self.assertTrue(hiders.TransformHider(batched_hider, transform).batched)
+        self.assertFalse(hiders.TransformHider(Mock(), transform).batched)
+        self.assertFalse(hiders.TransformHider(batched_hider, Mock()).batched)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -6,7 +6,13 @@ from unittest.mock import Mock
 
 import numpy as np
 
+from almiky.embedding.qim.dm import BinaryDM, BinaryDither
+from almiky.hiders import base
 from almiky.hiders import block as hiders
+from almiky.moments.matrix import TchebichefMatrix
+from almiky.quantization.scalar import UniformQuantizer
+from almiky.utils.payload import Payload
+from almiky.utils.scan.scan import ScanMapping
 
 
 class BlockBitHidderTest(TestCase):
@@ -48,6 +54,21 @@ class BlockBitHidderTest(TestCase):
 
         np.testing.assert_array_equal(ws_work, expected_ws_work)
 
+    def test_payload(self):
+        from almiky.utils.payload import Payload
+
+        cover = np.random.rand(4, 4)
+        base_hider = Mock()
+        base_hider.insert = Mock(side_effect=lambda block, bit, index: block)
+        hider = hiders.BlockBitHider(base_hider)
+
+        hider.insert(
+            cover, Payload.from_bits('0110'), block_shape=(2, 2), index=0)
+
+        self.assertEqual(
+            [call.args[1] for call in base_hider.insert.call_args_list],
+            [0, 1, 1, 0])
+
     def test_less_blocks_than_bits(self):
         cover = np.array([
             [0.72953648, 0.62911616, 0.51911824, 0.87013322],
@@ -87,7 +108,59 @@ class BlockBitHidderTest(TestCase):
 
         self.assertEqual(bit_hidder.extract.call_count, 4)
 
-        self.assertEqual(msg, '1001')
+        np.testing.assert_array_equal(msg, [1, 0, 0, 1])
+
+
+class BatchedBlockBitHidderTest(TestCase):
+    '''
+    Test for BlockBitHider with an hider chain supporting
+    batched operations
+    '''
+
+    def setUp(self):
+        embedder = BinaryDM(UniformQuantizer(10), BinaryDither(10, -2.5))
+        transform = TchebichefMatrix(8, N=8)
+        self.hider = base.TransformHider(
+            base.SingleBitHider(ScanMapping(), embedder), transform)
+        self.cover = np.random.randint(0, 256, (32, 24)).astype(float)
+
+    def test_insert(self):
+        msg = '0110100111'
+        hider = hiders.BlockBitHider(self.hider)
+
+        ws_work = hider.insert(self.cover, msg, index=4)
+
+        expected = np.copy(self.cover)
+        blocks = hiders.BlocksImage(expected)
+        for i, bit in enumerate(msg):
+            blocks[i] = self.hider.insert(blocks[i], bit, index=4)
+
+        np.testing.assert_array_almost_equal(ws_work, expected)
+
+    def test_extract(self):
+        msg = np.random.randint(0, 2, 12)
+        hider = hiders.BlockBitHider(self.hider)
+
+        ws_work = hider.insert(self.cover, msg, index=4)
+        extracted = hider.extract(ws_work, index=4)
+
+        self.assertEqual(extracted.dtype, np.uint8)
+        np.testing.assert_array_equal(extracted, msg)
+
+    def test_payload(self):
+        msg = Payload.from_text('almiky')
+        hider = hiders.BlockBitHider(self.hider)
+
+        ws_work = hider.insert(np.tile(self.cover, (2, 3)), msg, index=4)
+        extracted = hider.extract(ws_work, index=4)[:len(msg)]
+
+        self.assertEqual(Payload.from_bits(extracted).to_text(), 'almiky')
+
+    def test_capacity_exceded(self):
+        hider = hiders.BlockBitHider(self.hider)
+
+        with self.assertRaises(ValueError):
+            hider.insert(self.cover, '0' * 13, index=4)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,137 @@
+"""Test for colour image hiders"""
+
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from almiky.embedding.qim.dm import BinaryDM, BinaryDither
+from almiky.hiders import base
+from almiky.hiders.block import BlockBitHider
+from almiky.hiders.channel import ChannelHider
+from almiky.hiders.frequency import HidderEightFrequencyCoeficients
+from almiky.moments.matrix import TchebichefMatrix
+from almiky.quantization.scalar import UniformQuantizer
+from almiky.utils.scan.scan import ScanMapping
+
+
+class ChannelHiderTest(TestCase):
+
+    def setUp(self):
+        embedder = BinaryDM(UniformQuantizer(10), BinaryDither(10, -2.5))
+        self.plane_hider = BlockBitHider(base.TransformHider(
+            base.SingleBitHider(ScanMapping(), embedder),
+            TchebichefMatrix(8, N=8)
+        ))
+        self.cover = np.random.randint(0, 256, (32, 24, 3)).astype(float)
+
+    def test_rgb(self):
+        # Capacity is 12 blocks per channel
+        bits = np.random.randint(0, 2, 36)
+        hider = ChannelHider(self.plane_hider)
+
+        ws_work = hider.insert(self.cover, bits, index=4)
+        extracted = hider.extract(ws_work, index=4)
+
+        np.testing.assert_array_equal(extracted, bits)
+
+    def test_interleaved_bits(self):
+        bits = np.random.randint(0, 2, 20)
+        hider = ChannelHider(self.plane_hider)
+
+        ws_work = hider.insert(self.cover, bits, index=4)
+
+        for channel in range(3):
+            plane = ws_work[:, :, channel]
+            extracted = self.plane_hider.extract(plane, index=4)
+            np.testing.assert_array_equal(
+                extracted[:len(bits[channel::3])], bits[channel::3])
+
+    def test_capacity(self):
+        hider = ChannelHider(self.plane_hider)
+
+        with self.assertRaises(ValueError):
+            hider.insert(self.cover, np.zeros(37, dtype=int), index=4)
+
+    def test_channels(self):
+        bits = np.random.randint(0, 2, 24)
+        hider = ChannelHider(self.plane_hider, channels=(0, 2))
+
+        ws_work = hider.insert(self.cover, bits, index=4)
+
+        np.testing.assert_array_equal(ws_work[:, :, 1], self.cover[:, :, 1])
+        np.testing.assert_array_equal(hider.extract(ws_work, index=4), bits)
+
+    def test_workers(self):
+        bits = np.random.randint(0, 2, 36)
+
+        sequential = ChannelHider(self.plane_hider)
+        parallel = ChannelHider(self.plane_hider, workers=3)
+        ws_work = parallel.insert(self.cover, bits, index=4)
+
+        np.testing.assert_array_equal(
+            ws_work, sequential.insert(self.cover, bits, index=4))
+        np.testing.assert_array_equal(
+            parallel.extract(ws_work, index=4), bits)
+
+    def test_ycbcr(self):
+        bits = np.random.randint(0, 2, 36)
+        hider = ChannelHider(self.plane_hider, color_space='ycbcr')
+
+        ws_work = hider.insert(self.cover, bits, index=4)
+        extracted = hider.extract(ws_work, index=4)
+
+        np.testing.assert_array_equal(extracted, bits)
+
+    def integer_plane_hider(self):
+        # Embedding must survive rounding of integer works
+        embedder = BinaryDM(UniformQuantizer(40), BinaryDither(40, -10))
+        return BlockBitHider(base.TransformHider(
+            base.SingleBitHider(ScanMapping(), embedder),
+            TchebichefMatrix(8, N=8)
+        ))
+
+    def test_ycbcr_integer_work(self):
+        bits = np.random.randint(0, 2, 36)
+        hider = ChannelHider(
+            self.integer_plane_hider(), color_space='ycbcr')
+        cover = self.cover.astype(np.uint8)
+
+        ws_work = hider.insert(cover, bits, index=4)
+        extracted = hider.extract(ws_work, index=4)
+
+        self.assertEqual(ws_work.dtype, np.uint8)
+        np.testing.assert_array_equal(extracted, bits)
+
+    def test_rgb_integer_work(self):
+        bits = np.random.randint(0, 2, 192)
+        hider = ChannelHider(self.integer_plane_hider())
+        cover = np.random.randint(0, 256, (64, 64, 3)).astype(np.uint8)
+
+        ws_work = hider.insert(cover, bits, index=4)
+        extracted = hider.extract(ws_work, index=4)
+
+        self.assertEqual(ws_work.dtype, np.uint8)
+        np.testing.assert_array_equal(extracted, bits)
+
+    def test_invalid_color_space(self):
+        with self.assertRaises(ValueError):
+            ChannelHider(self.plane_hider, color_space='hsv')
+
+    def test_frequency_hider(self):
+        from almiky.moments.matrix import Transform
+        from almiky.utils.ortho_matrix import dct
+
+        bits = np.random.randint(0, 2, 200)
+        hider = ChannelHider(HidderEightFrequencyCoeficients(Transform(dct)))
+        cover = np.random.rand(32, 32, 3)
+
+        ws_work = hider.insert(cover, bits)
+        extracted = hider.extract(ws_work)
+
+        self.assertEqual(len(extracted), 3 * 16 * 8)
+        np.testing.assert_array_equal(extracted[:200], bits)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Test for batch embedding script"""
+
+import contextlib
+import csv
+import io
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import TestCase
+
+import imageio
+import numpy as np
+
+from almiky.hiders.scripts import embed
+
+
+class EmbedScriptTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.indir = Path(self.directory.name).joinpath('covers')
+        self.outdir = Path(self.directory.name).joinpath('stego')
+        self.indir.mkdir()
+
+        random = np.random.default_rng(0)
+        images = {
+            'gray.png': random.integers(20, 236, (64, 64)),
+            'colour.bmp': random.integers(20, 236, (64, 48, 3)),
+            'small.png': random.integers(20, 236, (8, 8)),
+            # Same stem as gray.png
+            'gray.bmp': random.integers(20, 236, (64, 64)),
+        }
+        for name, image in images.items():
+            path = self.indir.joinpath(name)
+            imageio.imwrite(str(path), image.astype(np.uint8))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_script(self, *args):
+        config = embed.parse_args(
+            [str(self.indir), '-o', str(self.outdir), '-w', '2',
+             '--chunk-size', '1'] + list(args))
+        report = io.StringIO()
+        failures = embed.run(config, report)
+        report.seek(0)
+        rows = {row['image']: row for row in csv.DictReader(report)}
+
+        return failures, rows
+
+    def test_embed(self):
+        failures, rows = self.run_script('--text', 'almiky', '--step', '24')
+
+        self.assertEqual(failures, 1)
+        self.assertEqual(
+            sorted(path.name for path in self.outdir.iterdir()),
+            ['colour.bmp.png', 'gray.bmp.png', 'gray.png.png'])
+
+        for name in ('gray.png', 'gray.bmp', 'colour.bmp'):
+            self.assertEqual(rows[name]['error'], '')
+            self.assertEqual(int(rows[name]['bits']), 48)
+            self.assertEqual(float(rows[name]['ber']), 0)
+            self.assertGreater(float(rows[name]['psnr']), 30)
+
+        # Capacity exceded
+        self.assertIn('ValueError', rows['small.png']['error'])
+
+    def test_hider_configuration(self):
+        failures, rows = self.run_script(
+            '--random-bits', '16', '--transform', 'dct', '--scan',
+            'row-major', '--index', '9', '--block-size', '4', '--step', '24')
+
+        # small.png has capacity for 4 bits
+        self.assertEqual(failures, 1)
+        self.assertEqual(float(rows['gray.png']['ber']), 0)
+        self.assertEqual(float(rows['colour.bmp']['ber']), 0)
+
+    def parse_invalid(self, *args):
+        with self.assertRaises(SystemExit), \
+                contextlib.redirect_stderr(io.StringIO()) as error:
+            embed.parse_args(
+                [str(self.indir), '-o', str(self.outdir), '--text', 'a'] +
+                list(args))
+
+        return error.getvalue()
+
+    def test_invalid_block_size(self):
+        error = self.parse_invalid(
+            '--transform', 'krawtchouk', '--block-size', '4')
+
+        self.assertIn('only available for 8x8 blocks', error)
+
+    def test_invalid_dither(self):
+        error = self.parse_invalid('--step', '10', '--d0', '8')
+
+        self.assertIn('invalid configuration', error)
+
+    def test_embed_16_bit(self):
+        random = np.random.default_rng(0)
+        cover = random.integers(5000, 60000, (64, 64)).astype(np.uint16)
+        for path in self.indir.iterdir():
+            path.unlink()
+        imageio.imwrite(str(self.indir.joinpath('deep.png')), cover)
+
+        failures, rows = self.run_script(
+            '--text', 'almiky', '--step', '24')
+        stego = imageio.imread(str(self.outdir.joinpath('deep.png.png')))
+
+        self.assertEqual(failures, 0)
+        self.assertEqual(stego.dtype, np.uint16)
+        self.assertEqual(float(rows['deep.png']['ber']), 0)
+        self.assertLess(np.abs(stego.astype(int) - cover).max(), 24)
+
+
+if __name__ == '__main__':
+    unittest.main()
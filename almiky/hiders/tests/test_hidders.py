@@ -4,24 +4,83 @@ from pathlib import Path
 import numpy as np
 
 from almiky.hiders import frequency
-# from almiky.utils import ortho_matrix
 
 base = Path(__file__).parent.parent.parent
 
-# class HidderFrequencyLeastSignificantBit(unittest.TestCase):
-#     def test_with_dct_8x8(self):
-#         from almiky.moments.matrix import Transform
-#         from almiky.utils.ortho_matrix import dct
 
-#         transform = Transform(dct)
-#         cover_array = np.random.rand(64, 64)
-#         hidder = frequency.HidderFrequencyLeastSignificantBit(transform)
+class HidderFrequencyLeastSignificantBit(unittest.TestCase):
+    def test_with_dct_8x8(self):
+        from almiky.moments.matrix import Transform
+        from almiky.utils.ortho_matrix import dct
+
+        transform = Transform(dct)
+        cover_array = np.random.rand(64, 64)
+        hidder = frequency.HidderFrequencyLeastSignificantBit(transform)
+
+        watermarked_array = hidder.insert(
+            cover_array, 'anier', coeficient_index=10)
+        msg = hidder.extract(watermarked_array, coeficient_index=10)
+
+        self.assertTrue(msg.startswith('anier'))
+
+    def test_payload_length(self):
+        from almiky.moments.matrix import Transform
+        from almiky.utils.ortho_matrix import dct
+
+        transform = Transform(dct)
+        cover_array = np.random.rand(64, 64)
+        bits = np.random.randint(0, 2, 43)
+        hidder = frequency.HidderFrequencyLeastSignificantBit(transform)
 
-#        watermarked_array = hidder.insert(
-#            cover_array, 'anier', coeficient_index=10)
-#         msg = hidder.extract(watermarked_array, coeficient_index=10)
+        watermarked_array = hidder.insert(cover_array, bits, 10)
+        extracted = hidder.extract_bits(watermarked_array, 10, length=43)
+
+        np.testing.assert_array_equal(extracted, bits)
+        # Blocks without payload are not modified
+        np.testing.assert_array_equal(
+            watermarked_array[48:], cover_array[48:])
+
+    def test_extract_text(self):
+        from almiky.moments.matrix import Transform
+        from almiky.utils import utils
+        from almiky.utils.ortho_matrix import dct
+
+        transform = Transform(dct)
+        cover_array = np.random.rand(64, 64)
+        hidder = frequency.HidderFrequencyLeastSignificantBit(transform)
+
+        watermarked_array = hidder.insert(cover_array, 'anier', 3)
+        bits = hidder.extract_bits(watermarked_array, 3, length=44)
+
+        self.assertEqual(
+            hidder.extract(watermarked_array, 3, length=44),
+            utils.bin2char(''.join(str(bit) for bit in bits)))
+
+    def test_empty_message(self):
+        from almiky.moments.matrix import Transform
+        from almiky.utils.ortho_matrix import dct
 
-#         self.assertTrue(msg.startswith('anier'))
+        cover_array = np.random.rand(64, 64)
+        hidder = frequency.HidderFrequencyLeastSignificantBit(Transform(dct))
+
+        for msg in ('', np.zeros(0, dtype=int)):
+            watermarked_array = hidder.insert(cover_array, msg, 3)
+            np.testing.assert_array_equal(watermarked_array, cover_array)
+
+        bits = hidder.extract_bits(cover_array, 3, length=0)
+        self.assertEqual(bits.dtype, np.uint8)
+        self.assertEqual(len(bits), 0)
+        self.assertEqual(hidder.extract(cover_array, 3, length=0), '')
+
+    def test_exceeded_capacity(self):
+        from almiky.exceptions import ExceededCapacity
+        from almiky.moments.matrix import Transform
+        from almiky.utils.ortho_matrix import dct
+
+        hidder = frequency.HidderFrequencyLeastSignificantBit(Transform(dct))
+
+        with self.assertRaises(ExceededCapacity):
+            hidder.insert(np.random.rand(64, 64), np.zeros(60, dtype=int), 3)
 
 
 class HidderEightFrequencyCoeficients(unittest.TestCase):
@@ -82,3 +141,31 @@ class HidderEightFrequencyCoeficients(unittest.TestCase):
         msg = hidder.extract(watermarked_array)
 
         self.assertTrue(msg.startswith(msg))
+
+    def test_extract_bits(self):
+        from almiky.moments.matrix import Transform
+        from almiky.utils.ortho_matrix import dct
+
+        trasform = Transform(dct)
+        cover_array = np.random.rand(32, 32, 3)
+        bits = np.random.randint(0, 2, 100)
+        hidder = frequency.HidderEightFrequencyCoeficients(trasform)
+
+        watermarked_array = hidder.insert(cover_array, bits)
+        extracted = hidder.extract_bits(watermarked_array)
+
+        self.assertEqual(extracted.dtype, np.uint8)
+        self.assertEqual(len(extracted), 16 * 8)
+        np.testing.assert_array_equal(extracted[:100], bits)
+        np.testing.assert_array_equal(
+            watermarked_array[:, :, 1:], cover_array[:, :, 1:])
+
+    def test_exceeded_capacity(self):
+        from almiky.exceptions import ExceededCapacity
+        from almiky.moments.matrix import Transform
+        from almiky.utils.ortho_matrix import dct
+
+        hidder = frequency.HidderEightFrequencyCoeficients(Transform(dct))
+
+        with self.assertRaises(ExceededCapacity):
+            hidder.insert(np.random.rand(16, 16), np.zeros(33, dtype=int))
@@ -6,31 +6,77 @@ from math import log10
 import numpy as np
 
 
+# Number of elements of each work processed at once by mse,
+# squared errors sums of 8 bits works must not overflow int32
+CHUNK_SIZE = 1 << 15
+
+
+def _work_dtype(*dtypes):
+    '''
+    Return dtype used to compute differences between works:
+    int32 for 8 bits integer works (exact), float32 for float32
+    works and float64 otherwise.
+    '''
+    if all(dtype.kind in 'biu' and dtype.itemsize == 1 for dtype in dtypes):
+        return np.dtype(np.int32)
+
+    dtype = np.result_type(*dtypes)
+    if dtype == np.float32:
+        return dtype
+
+    return np.dtype(np.float64)
+
+
 def mse(cover_work, ws_work):
     '''
     Calculate an return Mean Square Error (MSE)
     between a cover work an wattermaked work (or stego work)
+
+    Several watermarked works of the same cover can be given at
+    once stacked in the first axis: ws_work shape is (n,) + cover shape.
+    Then an array with the MSE of each one is returned.
+
+    Differences are computed in chunks of CHUNK_SIZE elements per work,
+    exactly with integers for 8 bits works, in float32 for float32
+    works and float64 otherwise; chunk sums are accumulated in float64.
     '''
 
-    if cover_work.shape != ws_work.shape:
+    if cover_work.shape == ws_work.shape:
+        batch = False
+    elif ws_work.shape[1:] == cover_work.shape:
+        batch = True
+    else:
         raise ValueError('Cover and watermak/stego work have different shape')
 
-    dims_cover = cover_work.shape
-    m = dims_cover[0]
-    n = dims_cover[1]
-    C, S = cover_work * 1.0, ws_work * 1.0
-    diff_pow = (np.abs(C) - np.abs(S)) ** 2
-    if len(dims_cover) == 2:
-        return sum(sum(diff_pow)) / (m * n)
-    elif len(dims_cover) == 3:
-        return sum(sum(sum(diff_pow))) / (m * n * dims_cover[2])
+    cover = np.asarray(cover_work).reshape(-1)
+    ws = np.asarray(ws_work).reshape(-1 if batch else 1, cover.size)
+    dtype = _work_dtype(cover.dtype, ws.dtype)
+
+    total = np.zeros(ws.shape[0])
+    for start in range(0, cover.size, CHUNK_SIZE):
+        chunk = slice(start, start + CHUNK_SIZE)
+        diff = np.subtract(ws[:, chunk], cover[chunk], dtype=dtype)
+        total += np.einsum('ij,ij->i', diff, diff)
+
+    errors = total / cover.size
+
+    return errors if batch else errors[0]
 
 
 def psnr(cover_array, stego_array, max=255):
     '''
     Peak Signal-to-Noise Ratio (PSNR)
+
+    Several stego works of the same cover can be given at once,
+    see help(mse). Then an array of PSNR values is returned.
     '''
-    RMSE = mse(cover_array, stego_array) or 1 / cover_array.size
+    RMSE = mse(cover_array, stego_array)
+
+    if np.ndim(RMSE):
+        RMSE = np.where(RMSE == 0, 1 / cover_array.size, RMSE)
+        return 10 * np.log10(max ** 2 / RMSE)
+
+    RMSE = RMSE or 1 / cover_array.size
     return 10 * log10(max ** 2 / RMSE) if RMSE else 100
 
 
@@ -62,3 +108,140 @@ def uiqi(cover_array, stego_array, axis=(0, 1)):
     index = (4 * Scs * Mc * Ms) / ((Vc + Vs) * (Mc2 + Ms2))
 
     return np.mean(index)
+
+
+def _window_sums(data, window, axes):
+    '''
+    Return sums of data in all windows of length (window) along axes,
+    shape of each axis is reduced to length - window + 1. Summed-area
+    tables are used, so cost does not depend on window size.
+    '''
+    for axis in axes:
+        if window > data.shape[axis]:
+            raise ValueError('Window is larger than work')
+        data = np.moveaxis(data, axis, 0)
+        sums = np.zeros((data.shape[0] + 1,) + data.shape[1:])
+        np.cumsum(data, axis=0, out=sums[1:])
+        data = np.moveaxis(sums[window:] - sums[:-window], 0, axis)
+
+    return data
+
+
+def _window_statistics(cover_array, stego_array, window, axis):
+    '''
+    Return (batch, means, variances, covariance) of cover and stego works
+    in each window. See help(windowed_uiqi).
+    '''
+    if cover_array.shape == stego_array.shape:
+        batch = False
+    elif stego_array.shape[1:] == cover_array.shape:
+        batch = True
+    else:
+        raise ValueError('Cover and watermak/stego work have different shape')
+
+    cover = np.asarray(cover_array, dtype=np.float64)
+    stego = np.asarray(stego_array, dtype=np.float64)
+    axes = tuple(axis % cover.ndim for axis in axis)
+    stego_axes = tuple(axis + batch for axis in axes)
+    size = window ** len(axes)
+
+    Sc = _window_sums(cover, window, axes)
+    Ss = _window_sums(stego, window, stego_axes)
+    Scc = _window_sums(cover ** 2, window, axes)
+    Sss = _window_sums(stego ** 2, window, stego_axes)
+    Scs = _window_sums(cover * stego, window, stego_axes)
+
+    # Exact for integer works: sums are integers lower than 2 ** 53
+    size2 = size ** 2
+    means = Sc / size, Ss / size
+    variances = (size * Scc - Sc ** 2) / size2, (size * Sss - Ss ** 2) / size2
+    covariance = (size * Scs - Sc * Ss) / size2
+
+    return batch, means, variances, covariance
+
+
+def _quality_mean(quality, batch):
+    '''
+    Return mean of a quality map, one value for each work in a batch
+    '''
+    if batch:
+        return quality.reshape(quality.shape[0], -1).mean(axis=1)
+
+    return quality.mean()
+
+
+def windowed_uiqi(cover_array, stego_array, window=8, axis=(0, 1)):
+    '''
+    Universal Image Quality Index computed in a sliding window.
+    Return (mean, quality map), map has a value for each window
+    position: each axis length is reduced to length - window + 1.
+
+    Windows with zero variance in both works get index
+    2 * Mc * Ms / (Mc^2 + Ms^2), or 1 if means are zero too.
+
+    Several stego works of the same cover can be given at once
+    stacked in the first axis, then mean is an array with the mean
+    index of each one.
+
+    Arguments:
+    cover_array -- array containing cover data
+    stego_array -- array containing stego data
+    window -- window length along each axis (default is 8)
+    axis -- axes along which the window slides.
+        The default is (0, 1).
+
+    Usage:
+    mean, quality = windowed_uiqi(cover, stego)
+    '''
+    batch, (Mc, Ms), (Vc, Vs), Scs = _window_statistics(
+        cover_array, stego_array, window, axis)
+
+    variances = Vc + Vs
+    means = Mc ** 2 + Ms ** 2
+    numerator = 4 * Scs * Mc * Ms
+    denominator = variances * means
+
+    quality = np.ones(np.broadcast(numerator, denominator).shape)
+    defined = denominator != 0
+    quality[defined] = numerator[defined] / denominator[defined]
+    flat = (variances == 0) & (means != 0)
+    quality[flat] = (2 * Mc * Ms / np.where(means, means, 1))[flat]
+
+    return _quality_mean(quality, batch), quality
+
+
+def ssim(cover_array, stego_array, window=7, axis=(0, 1), max=255):
+    '''
+    Structural Similarity Index (SSIM) computed in a uniform sliding
+    window with sample covariances. Return (mean, SSIM map), map has a
+    value for each window position (see help(windowed_uiqi)).
+
+    Several stego works of the same cover can be given at once
+    stacked in the first axis, then mean is an array with the mean
+    SSIM of each one.
+
+    Arguments:
+    cover_array -- array containing cover data
+    stego_array -- array containing stego data
+    window -- window length along each axis (default is 7)
+    axis -- axes along which the window slides.
+        The default is (0, 1).
+    max -- maximun amplitude (default is 255)
+
+    Usage:
+    mean, quality = ssim(cover, stego)
+    '''
+    batch, (Mc, Ms), (Vc, Vs), Scs = _window_statistics(
+        cover_array, stego_array, window, axis)
+
+    size = window ** len(axis)
+    sample = size / (size - 1)
+    C1 = (0.01 * max) ** 2
+    C2 = (0.03 * max) ** 2
+
+    quality = (
+        (2 * Mc * Ms + C1) * (2 * sample * Scs + C2) /
+        ((Mc ** 2 + Ms ** 2 + C1) * (sample * (Vc + Vs) + C2))
+    )
+
+    return _quality_mean(quality, batch), quality
@@ -2,6 +2,62 @@
 Robustness performance metrics
 '''
 
+from collections import namedtuple
+
+import numpy as np
+
+from almiky.utils.payload import Payload, as_bits
+
+
+# Number of bits set in each byte value
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+BERStatistics = namedtuple(
+    'BERStatistics', ['rate', 'errors', 'bursts', 'max_burst', 'mean_burst'])
+BERStatistics.__doc__ = '''
+Bit errors between two watermarks:
+rate -- Bit Error Rate (BER)
+errors -- number of bits incorrectly decoded
+bursts -- number of bursts (runs of consecutive bit errors)
+max_burst -- length of the longest burst
+mean_burst -- mean length of bursts (0 if there is no error)
+'''
+
+
+def packed(watermark):
+    '''
+    Return (packed, length): bits of a watermark packed in a uint8 array
+    and number of bits. Raise ValueError if watermark is invalid binary
+    data.
+
+    Arguments:
+    watermark -- Payload, packed bits as bytes, str of binary data
+        or array of bits
+    '''
+    if isinstance(watermark, Payload):
+        return watermark.packed, len(watermark)
+
+    if isinstance(watermark, (bytes, bytearray)):
+        data = np.frombuffer(watermark, dtype=np.uint8)
+        return data, data.size * 8
+
+    bits = as_bits(watermark)
+    return np.packbits(bits), bits.size
+
+
+def _count_errors(ipacked, epacked, number_bits):
+    '''
+    Return number of different bits between packed bits up to
+    number_bits, epacked can be a (n, bytes) batch.
+    '''
+    nbytes = -(-number_bits // 8)
+    diff = np.bitwise_xor(ipacked[:nbytes], epacked[..., :nbytes])
+    if number_bits % 8:
+        # Exclude padding bits of the last byte
+        diff[..., -1] &= (0xFF << (8 - number_bits % 8)) & 0xFF
+
+    return POPCOUNT[diff].sum(axis=-1, dtype=np.int64)
+
 
 def ber(iwatermark, ewatermark):
     '''
@@ -10,9 +66,14 @@ def ber(iwatermark, ewatermark):
     sequence. Is posible to process watermarks of different size,
     min size bits are only tested.
 
+    Watermarks are compared packed, eight bits at once (xor and
+    popcount).
+
     Arguments:
-    iwatermark -- watermark inserted as str of binary data
-    iwatermark -- watermark inserted as str of binary data
+    iwatermark -- watermark inserted: Payload, packed bits as bytes,
+        str of binary data or array of bits
+    ewatermark -- watermark extracted: Payload, packed bits as bytes,
+        str of binary data or array of bits
 
     Usage:
     ber('0101110', '0111011111')
@@ -22,34 +83,92 @@ def ber(iwatermark, ewatermark):
     ber('1011', '') => raise ValueError
     '''
 
-    def check(ibit, ebit):
-        '''
-        Check if two bit are equals; return 1 if are not equals,
-        return 0 otherwise. Raise an exception if arguments are
-        invalid bits.
+    ipacked, ilength = packed(iwatermark)
+    epacked, elength = packed(ewatermark)
+
+    number_bits = min(ilength, elength)
+    if not number_bits:
+        raise ValueError('Watermark length must not be empty')
+
+    incorrectly_decoded = _count_errors(ipacked, epacked, number_bits)
+
+    return int(incorrectly_decoded) / number_bits
+
+
+def ber_matrix(iwatermark, ewatermarks):
+    '''
+    Calculate the Bit Error Rate (BER) of several extracted watermarks,
+    for example extracted from attacked versions of a work, and return
+    them as a numpy array. See help(ber).
+
+    Arguments:
+    iwatermark -- watermark inserted
+    ewatermarks -- watermarks extracted: (n, bits) array of bits or a
+        sequence of watermarks. A 1-D array is a single watermark.
+
+    Usage:
+    ber_matrix('0101', ['0111', '0101', '1010']) => array([0.25, 0, 1])
+    '''
+
+    ipacked, ilength = packed(iwatermark)
+
+    if isinstance(ewatermarks, np.ndarray) and ewatermarks.ndim <= 2:
+        ewatermarks = np.atleast_2d(ewatermarks)
+        batch = as_bits(ewatermarks).reshape(ewatermarks.shape)
+        elength = batch.shape[1]
+        epacked = np.packbits(batch, axis=1)
+    else:
+        watermarks = [packed(watermark) for watermark in ewatermarks]
+        if not watermarks:
+            return np.zeros(0)
+        lengths = {length for _, length in watermarks}
+        if len(lengths) > 1:
+            return np.array([
+                ber(iwatermark, watermark) for watermark in ewatermarks])
+        elength = lengths.pop()
+        epacked = np.stack([data for data, _ in watermarks])
 
-        Arguments:
-        ibit -- bit represented as str object
-        ebit -- bit represented as str object
-        '''
-        if any((bit not in ('0', '1') for bit in (ibit, ebit))):
-            raise ValueError
+    number_bits = min(ilength, elength)
+    if not number_bits:
+        raise ValueError('Watermark length must not be empty')
 
-        return int(ibit) ^ int(ebit)
+    return _count_errors(ipacked, epacked, number_bits) / number_bits
 
-    try:
-        incorrectly_decoded = sum(
-            (
-                check(ibit, ebit)
-                for ibit, ebit in
-                zip(iwatermark, ewatermark)
-            )
-        )
-        number_bits = min(len(iwatermark), len(ewatermark))
 
-        return incorrectly_decoded / number_bits
+def ber_statistics(iwatermark, ewatermark):
+    '''
+    Return bit error statistics (see help(BERStatistics)) between
+    watermark inserted and watermark extracted. Bursts are runs of
+    consecutive bits incorrectly decoded. See help(ber).
 
-    except ZeroDivisionError:
+    Usage:
+    ber_statistics('0101110', '1100010') =>
+        BERStatistics(rate=0.428, errors=3, bursts=2, max_burst=2,
+                      mean_burst=1.5)
+    '''
+
+    ipacked, ilength = packed(iwatermark)
+    epacked, elength = packed(ewatermark)
+
+    number_bits = min(ilength, elength)
+    if not number_bits:
         raise ValueError('Watermark length must not be empty')
-    except ValueError:
-        raise ValueError('Invalid binary data')
+
+    nbytes = -(-number_bits // 8)
+    errors = np.unpackbits(
+        np.bitwise_xor(ipacked[:nbytes], epacked[:nbytes]),
+        count=number_bits
+    ).astype(np.int8)
+
+    # Burst starts (+1) and ends (-1)
+    edges = np.diff(errors, prepend=0, append=0)
+    lengths = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+    count = int(errors.sum(dtype=np.int64))
+
+    return BERStatistics(
+        rate=count / number_bits,
+        errors=count,
+        bursts=lengths.size,
+        max_burst=int(lengths.max()) if lengths.size else 0,
+        mean_burst=float(lengths.mean()) if lengths.size else 0.0,
+    )
@@ -40,6 +40,32 @@ class TestMSE(unittest.TestCase):
         mse = metrics.mse(cover_work, ws_work)
         np.testing.assert_almost_equal(mse, 13.78, 3)
 
+    def test_uint8_images(self):
+        cover_work = np.array([[0, 255], [10, 200]], dtype=np.uint8)
+        ws_work = np.array([[255, 0], [12, 190]], dtype=np.uint8)
+
+        mse = metrics.mse(cover_work, ws_work)
+        self.assertEqual(mse, (2 * 255 ** 2 + 4 + 100) / 4)
+
+    def test_batch(self):
+        cover_work = np.random.randint(0, 256, (16, 12, 3))
+        ws_works = np.random.randint(0, 256, (5, 16, 12, 3))
+
+        mse = metrics.mse(cover_work, ws_works)
+
+        np.testing.assert_array_almost_equal(
+            mse, [np.mean((ws - cover_work) ** 2.) for ws in ws_works])
+
+    @patch.object(metrics, 'CHUNK_SIZE', 7)
+    def test_chunks(self):
+        cover_work = np.random.rand(9, 5).astype(np.float32)
+        ws_work = np.random.rand(9, 5).astype(np.float32)
+
+        mse = metrics.mse(cover_work, ws_work)
+
+        np.testing.assert_almost_equal(
+            mse, np.mean((ws_work - cover_work.astype(float)) ** 2), 6)
+
 
 def mse_non_zero_mock(cover_work, ws_work):
     '''
@@ -100,6 +126,136 @@ class TestPSNR(unittest.TestCase):
         psnr = metrics.psnr(cover_work, ws_work, max=200)
         np.testing.assert_almost_equal(psnr, 26.020599913, 3)
 
+    def test_batch(self):
+        cover_work = np.array([[2.2, 3.3], [5.5, 6.6]])
+        ws_works = np.array([
+            [[2.2, 3.3], [5.5, 6.6]],
+            [[4.4, 7.7], [9.9, 10.0]],
+        ])
+
+        psnr = metrics.psnr(cover_work, ws_works)
+
+        np.testing.assert_array_almost_equal(
+            psnr, [54.151403522, metrics.psnr(cover_work, ws_works[1])])
+
+
+def window_statistics(cover, stego):
+    '''
+    Return means, variances and covariance of two windows
+    '''
+    return (
+        cover.mean(), stego.mean(), cover.var(), stego.var(),
+        np.mean((cover - cover.mean()) * (stego - stego.mean()))
+    )
+
+
+class TestWindowedUIQI(unittest.TestCase):
+    '''
+    Testing Universal Image Quality Index in a sliding window
+    '''
+
+    def test_window_size_of_image(self):
+        cover_work = np.random.randint(0, 256, (8, 8))
+        ws_work = np.random.randint(0, 256, (8, 8))
+
+        mean, quality = metrics.windowed_uiqi(cover_work, ws_work)
+
+        self.assertEqual(quality.shape, (1, 1))
+        np.testing.assert_almost_equal(
+            mean, metrics.uiqi(cover_work * 1., ws_work * 1.))
+
+    def test_quality_map(self):
+        cover_work = np.random.rand(9, 7)
+        ws_work = np.random.rand(9, 7)
+
+        mean, quality = metrics.windowed_uiqi(cover_work, ws_work, window=3)
+
+        expected = np.empty((7, 5))
+        for i in range(7):
+            for j in range(5):
+                Mc, Ms, Vc, Vs, Scs = window_statistics(
+                    cover_work[i:i + 3, j:j + 3], ws_work[i:i + 3, j:j + 3])
+                expected[i, j] = (
+                    4 * Scs * Mc * Ms / ((Vc + Vs) * (Mc ** 2 + Ms ** 2)))
+
+        np.testing.assert_array_almost_equal(quality, expected)
+        np.testing.assert_almost_equal(mean, expected.mean())
+
+    def test_flat_windows(self):
+        cover_work = np.full((10, 10), 7)
+
+        mean, quality = metrics.windowed_uiqi(cover_work, cover_work)
+        self.assertEqual(mean, 1)
+
+        mean, quality = metrics.windowed_uiqi(
+            cover_work, np.full((10, 10), 3))
+        np.testing.assert_almost_equal(mean, 42 / 58)
+
+    def test_batch(self):
+        cover_work = np.random.randint(0, 256, (20, 16, 3))
+        ws_works = np.random.randint(0, 256, (4, 20, 16, 3))
+
+        mean, quality = metrics.windowed_uiqi(cover_work, ws_works)
+
+        self.assertEqual(quality.shape, (4, 13, 9, 3))
+        for ws_work, ws_mean, ws_quality in zip(ws_works, mean, quality):
+            expected = metrics.windowed_uiqi(cover_work, ws_work)
+            np.testing.assert_almost_equal(ws_mean, expected[0])
+            np.testing.assert_array_almost_equal(ws_quality, expected[1])
+
+    def test_invalid_window(self):
+        cover_work = np.random.rand(6, 6)
+
+        with self.assertRaises(ValueError):
+            metrics.windowed_uiqi(cover_work, cover_work)
+
+        with self.assertRaises(ValueError):
+            metrics.windowed_uiqi(cover_work, np.random.rand(6, 7), window=2)
+
+
+class TestSSIM(unittest.TestCase):
+    '''
+    Testing Structural Similarity Index (SSIM)
+    '''
+
+    def test_images_equals(self):
+        cover_work = np.random.randint(0, 256, (16, 16))
+
+        mean, quality = metrics.ssim(cover_work, cover_work)
+
+        self.assertEqual(quality.shape, (10, 10))
+        np.testing.assert_almost_equal(mean, 1)
+
+    def test_quality_map(self):
+        cover_work = np.random.randint(0, 256, (9, 7))
+        ws_work = np.random.randint(0, 256, (9, 7))
+        C1, C2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+
+        mean, quality = metrics.ssim(cover_work, ws_work, window=3)
+
+        expected = np.empty((7, 5))
+        for i in range(7):
+            for j in range(5):
+                Mc, Ms, Vc, Vs, Scs = window_statistics(
+                    cover_work[i:i + 3, j:j + 3], ws_work[i:i + 3, j:j + 3])
+                # Sample covariances
+                Vc, Vs, Scs = np.array([Vc, Vs, Scs]) * 9 / 8
+                expected[i, j] = (
+                    (2 * Mc * Ms + C1) * (2 * Scs + C2) /
+                    ((Mc ** 2 + Ms ** 2 + C1) * (Vc + Vs + C2)))
+
+        np.testing.assert_array_almost_equal(quality, expected)
+        np.testing.assert_almost_equal(mean, expected.mean())
+
+    def test_batch(self):
+        cover_work = np.random.randint(0, 256, (12, 12))
+        ws_works = np.random.randint(0, 256, (3, 12, 12))
+
+        mean, quality = metrics.ssim(cover_work, ws_works)
+
+        np.testing.assert_array_almost_equal(
+            mean, [metrics.ssim(cover_work, ws)[0] for ws in ws_works])
+
 
 if __name__ == '__main__':
     unittest.main()
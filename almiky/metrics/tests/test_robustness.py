@@ -4,7 +4,10 @@ Test for imperceptibility performance metrics
 
 import unittest
 
+import numpy as np
+
 from almiky.metrics import robustness as metrics
+from almiky.utils.payload import Payload
 
 
 class TestBER(unittest.TestCase):
@@ -48,6 +51,82 @@ class TestBER(unittest.TestCase):
         ber = metrics.ber(iwatermark, ewatermark)
         self.assertEqual(ber, 0.4)
 
+    def test_bit_arrays(self):
+        iwatermark = Payload.from_bits('1011001010')
+        ewatermark = np.array([1, 1, 1, 1, 0, 0, 0, 1, 1, 1, 0, 1])
+
+        ber = metrics.ber(iwatermark, ewatermark)
+        self.assertEqual(ber, 0.4)
+
+    def test_packed_bytes(self):
+        iwatermark = bytes([0b10110010, 0b10000000])
+        ewatermark = '1111000111'
+
+        ber = metrics.ber(iwatermark, ewatermark)
+        self.assertEqual(ber, 0.4)
+
+    def test_large_watermarks(self):
+        iwatermark = np.random.randint(0, 2, 100003)
+        ewatermark = np.random.randint(0, 2, 100003)
+
+        ber = metrics.ber(iwatermark, ewatermark)
+        self.assertAlmostEqual(ber, np.mean(iwatermark != ewatermark))
+
+
+class TestBERMatrix(unittest.TestCase):
+
+    def test_batch_array(self):
+        iwatermark = '1011001010'
+        ewatermarks = np.array([
+            [1, 1, 1, 1, 0, 0, 0, 1, 1, 1],
+            [1, 0, 1, 1, 0, 0, 1, 0, 1, 0],
+            [0, 1, 0, 0, 1, 1, 0, 1, 0, 1],
+        ])
+
+        np.testing.assert_array_almost_equal(
+            metrics.ber_matrix(iwatermark, ewatermarks), [0.4, 0, 1])
+
+    def test_sequence(self):
+        iwatermark = Payload.from_bits('1011001010')
+        ewatermarks = ['1111000111', '10110', '0100110101']
+
+        np.testing.assert_array_almost_equal(
+            metrics.ber_matrix(iwatermark, ewatermarks), [0.4, 0, 1])
+
+    def test_single_array(self):
+        '''
+        A 1-D array is one watermark, not a batch of one bit watermarks
+        '''
+        ewatermark = np.array([1, 1, 1, 1, 0, 0, 0, 1, 1, 1])
+
+        np.testing.assert_array_almost_equal(
+            metrics.ber_matrix('1011001010', ewatermark), [0.4])
+
+    def test_invalid_binary_data(self):
+        with self.assertRaises(ValueError):
+            metrics.ber_matrix('1011', np.array([[1, 0, 2, 1]]))
+
+
+class TestBERStatistics(unittest.TestCase):
+
+    def test_bursts(self):
+        statistics = metrics.ber_statistics('0101110001', '1100000111')
+
+        self.assertEqual(statistics.rate, 0.6)
+        self.assertEqual(statistics.errors, 6)
+        self.assertEqual(statistics.bursts, 3)
+        self.assertEqual(statistics.max_burst, 3)
+        self.assertEqual(statistics.mean_burst, 2)
+
+    def test_without_errors(self):
+        statistics = metrics.ber_statistics('0101', '0101')
+
+        self.assertEqual(statistics, (0, 0, 0, 0, 0))
+
+    def test_watermark_zero_length(self):
+        with self.assertRaises(ValueError):
+            metrics.ber_statistics('', '0101')
+
 
 if __name__ == '__main__':
     unittest.main()
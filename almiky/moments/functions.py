@@ -7,6 +7,8 @@ Each orthogonal function is defined in a derivated class of OrtogonalFunction.
 '''
 
 import math
+
+import numpy as np
 from scipy import special
 from mpmath import qp, mp, qhyper, hyp3f2
 
@@ -49,8 +51,60 @@ class OrtogonalFunction:
         '''
         raise NotImplementedError
 
+    def eval_table(self, xs, max_order):
+        '''
+        func.eval_table(xs, max_order) => numpy array, return evaluation
+        of the ortogonal function in each x of xs (rows) for orders
+        0..max_order (columns)
+        '''
+        return np.array([
+            [float(self.eval(x, order)) for order in range(max_order + 1)]
+            for x in xs
+        ])
+
+
+class ThreeTermRecurrence:
+    r'''
+    Evaluate an ortogonal function for all orders at several points
+    in one sweep using its three term recurrence relation:
+
+    p[n + 1](x) = a[n](x) * p[n](x) + b[n](x) * p[n - 1](x)
+
+    where p[0](x) = 1 and b[0](x) = 0. Derivated classes must implement
+    recurrence(...) method returning a[n](x) and b[n](x) coefficients.
+
+    class FunctionX(ThreeTermRecurrence, OrtogonalFunction)
+        def recurrence(...)
+            ...
+    '''
+
+    def recurrence(self, x, order):
+        '''
+        func.recurrence(x, order) => (a, b), return coefficients of
+        three term recurrence relation for an order. x is a numpy array.
+        '''
+        raise NotImplementedError
+
+    def eval_table(self, xs, max_order):
+        '''
+        func.eval_table(xs, max_order) => numpy array, return evaluation
+        of the ortogonal function in each x of xs (rows) for orders
+        0..max_order (columns)
+        '''
+        xs = np.asarray(xs, dtype=float)
+        table = np.empty(xs.shape + (max_order + 1,))
+        table[..., 0] = 1
+        previous = np.zeros(xs.shape)
+
+        for order in range(max_order):
+            a, b = self.recurrence(xs, order)
+            table[..., order + 1] = a * table[..., order] + b * previous
+            previous = table[..., order]
 
-class QHahnFunction(OrtogonalFunction):
+        return table
+
+
+class QHahnFunction(ThreeTermRecurrence, OrtogonalFunction):
 
     def __init__(self, q, alpha, beta, N):
         super().__init__()
@@ -72,6 +126,25 @@ class QHahnFunction(OrtogonalFunction):
             qp(self.q, self.q, k)
         )
 
+    def recurrence(self, x, order):
+        q, alpha, beta, N, n = self.q, self.alpha, self.beta, self.N, order
+        A = (
+            (1 - q ** (n - N)) *
+            (1 - alpha * q ** (n + 1)) *
+            (1 - alpha * beta * q ** (n + 1)) /
+            (1 - alpha * beta * q ** (2 * n + 1)) /
+            (1 - alpha * beta * q ** (2 * n + 2))
+        )
+        C = (
+            -alpha * q ** (n - N) *
+            (1 - q ** n) *
+            (1 - alpha * beta * q ** (n + N + 1)) *
+            (1 - beta * q ** n) /
+            (1 - alpha * beta * q ** (2 * n)) /
+            (1 - alpha * beta * q ** (2 * n + 1))
+        )
+        return (A + C - (1 - q ** -x)) / A, np.full(x.shape, -C / A)
+
     def norm(self, order):
         if order < 0:
             return 0
@@ -99,7 +172,7 @@ class QHahnFunction(OrtogonalFunction):
             )
 
 
-class CharlierFunction(OrtogonalFunction):
+class CharlierFunction(ThreeTermRecurrence, OrtogonalFunction):
 
     def __init__(self, alpha):
         super().__init__()
@@ -114,6 +187,12 @@ class CharlierFunction(OrtogonalFunction):
             math.factorial(k)
         )
 
+    def recurrence(self, x, order):
+        return (
+            x - order - self.alpha,
+            np.full(x.shape, -self.alpha * order)
+        )
+
     def norm(self, order):
         if order < 0:
             return 0
@@ -123,6 +202,10 @@ class CharlierFunction(OrtogonalFunction):
 
 class CharlierSobolevFunction(CharlierFunction):
 
+    # Charlier recurrence relation does not hold for Sobolev type
+    eval_table = OrtogonalFunction.eval_table
+    recurrence = ThreeTermRecurrence.recurrence
+
     def __init__(self, alpha, beta, gamma):
         super().__init__(alpha)
         self.beta = beta
@@ -192,7 +275,7 @@ class CharlierSobolevFunction(CharlierFunction):
         )
 
 
-class QKrawtchoukFunction(OrtogonalFunction):
+class QKrawtchoukFunction(ThreeTermRecurrence, OrtogonalFunction):
 
     def __init__(self, p, q, N):
         self.q = q
@@ -212,6 +295,23 @@ class QKrawtchoukFunction(OrtogonalFunction):
             qp(self.q, self.q, k) ** -1
         )
 
+    def recurrence(self, x, order):
+        q, p, N, n = self.q, self.p, self.N, order
+        A = (
+            (1 - q ** (n - N)) *
+            (1 + p * q ** n) /
+            (1 + p * q ** (2 * n)) /
+            (1 + p * q ** (2 * n + 1))
+        )
+        C = (
+            -p * q ** (2 * n - N - 1) *
+            (1 + p * q ** (n + N)) *
+            (1 - q ** n) /
+            (1 + p * q ** (2 * n - 1)) /
+            (1 + p * q ** (2 * n))
+        )
+        return (A + C - (1 - q ** -x)) / A, np.full(x.shape, -C / A)
+
     def norm(self, order):
         # TODO: Who is n?
         n = None
@@ -242,10 +342,17 @@ class QKrawtchoukFunction(OrtogonalFunction):
             )
 
 
-class TchebichefFunction():
+class TchebichefFunction(ThreeTermRecurrence):
     def __init__(self, N):
         self.N = N
 
+    def recurrence(self, x, order):
+        n = order
+        return (
+            (2 * n + 1) * (2 * x - self.N + 1) / (n + 1),
+            np.full(x.shape, -n * (self.N ** 2 - n ** 2) / (n + 1))
+        )
+
     def eval(self, x, order):
         mp.dps = 25
         mp.pretty = True
@@ -263,11 +370,19 @@ class TchebichefFunction():
         )
 
 
-class QCharlierFunction():
+class QCharlierFunction(ThreeTermRecurrence):
     def __init__(self, a, q):
         self.a = a
         self.q = q
 
+    def recurrence(self, x, order):
+        q, a, n = self.q, self.a, order
+        B = q * (1 - q ** n) * (a + q ** n)
+        return (
+            (a + B + q ** (2 * n + 1) * (1 - q ** -x)) / a,
+            np.full(x.shape, -B / a)
+        )
+
     def eval(self, x, order):
         mp.dps = 25
         mp.pretty = True
@@ -279,7 +394,7 @@ class QCharlierFunction():
         mp.pretty = True
         return (
             self.q ** -order *
-            special.qp(-self.a, self.q) *
-            special.qp(-self.a ** -1 * self.q, self.q, order) *
-            special.qp(self.q, self.q, order)
+            qp(-self.a, self.q) *
+            qp(-self.a ** -1 * self.q, self.q, order) *
+            qp(self.q, self.q, order)
         )
@@ -1,7 +1,15 @@
 '''It define orthogonal matrix from orthogonal forms.'''
 
+from collections import OrderedDict
+import hashlib
+import os
+from pathlib import Path
+import threading
+
 import numpy as np
 
+from almiky.exceptions import NotMatrixQuasiOrthogonal
+
 from .orthogonal_forms import (
     CharlierForm, CharlierSobolevForm, QHahnForm, QKrawtchoukForm,
     QCharlierForm, TchebichefForm)
@@ -21,6 +29,27 @@ class SeparableTransform:
             np.dot(A, self.r_orthon_matrix.T)
         )
 
+    def direct_blocks(self, blocks):
+        '''
+        obj.direct_blocks(blocks) => (np.array): return direct moments of
+        all blocks at once. (blocks) is a stack of blocks with shape
+        (..., rows, cols), for example (nblocks, 8, 8).
+        '''
+        return np.matmul(
+            self.l_orthon_matrix.T,
+            np.matmul(blocks, self.r_orthon_matrix)
+        )
+
+    def inverse_blocks(self, blocks):
+        '''
+        obj.inverse_blocks(blocks) => (np.array): return inverse moments
+        of all blocks at once. See help(obj.direct_blocks).
+        '''
+        return np.matmul(
+            self.l_orthon_matrix,
+            np.matmul(blocks, self.r_orthon_matrix.T)
+        )
+
 
 class Transform:
     def __init__(self, ortho_matrix):
@@ -42,6 +71,21 @@ class Transform:
         '''
         return self.transform.inverse(data)
 
+    def direct_blocks(self, blocks):
+        '''
+        obj.direct_blocks(blocks) => (np.array): return direct matrix
+        moments of a stack of blocks. (blocks) is a (np.array) with shape
+        (..., N, N) where (N, N) is the (self.ortho_matrix shape)
+        '''
+        return self.transform.direct_blocks(blocks)
+
+    def inverse_blocks(self, blocks):
+        '''
+        obj.inverse_blocks(blocks) => (np.array): return inverse matrix
+        moments of a stack of blocks. See help(obj.direct_blocks).
+        '''
+        return self.transform.inverse_blocks(blocks)
+
 
 class ImageTransform:
     def __init__(self, transform, max_amplitude=255):
@@ -55,6 +99,127 @@ class ImageTransform:
         inverted = self.transform.inverse(data)
         return np.clip(np.rint(inverted), 0, self.max_amplitude)
 
+    def direct_blocks(self, blocks):
+        return self.transform.direct_blocks(blocks)
+
+    def inverse_blocks(self, blocks):
+        inverted = self.transform.inverse_blocks(blocks)
+        return np.clip(np.rint(inverted), 0, self.max_amplitude)
+
+
+class MatrixCache:
+    '''
+    Process wide cache of orthogonal matrix values with LRU eviction.
+
+    Values are keyed by matrix class, dimension and parameters, so
+    building the same matrix again does not evaluate orthogonal forms:
+    cache = MatrixCache(maxsize=32)
+    values = cache(QHahnMatrix-instance)
+
+    Optionally values are stored too in a directory as .npy files
+    and reused across processes:
+    cache = MatrixCache(directory='/tmp/almiky')
+
+    Default cache (matrix_cache) use the directory set in
+    ALMIKY_MATRIX_CACHE environment variable if it is defined.
+    '''
+
+    # Version of generated values, it must be increased when the way
+    # values are computed changes, so stored files are not reused
+    version = 3
+
+    def __init__(self, maxsize=32, directory=None):
+        '''
+        Initialize self. See help(type(self)) for accurate signature.
+
+        Arguments:
+        maxsize -- max number of matrices kept in memory
+        directory -- directory where .npy files are stored (default is
+            None: matrices are not stored)
+        '''
+        self.maxsize = maxsize
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def key(self, matrix):
+        '''
+        Return the cache key of an orthogonal matrix instance
+        '''
+        cls = type(matrix)
+        parameters = tuple(sorted(matrix.parameters.items()))
+        return (
+            cls.__module__, cls.__qualname__, matrix.dimension, parameters,
+            getattr(matrix, 'stable_dimension', None), self.version
+        )
+
+    def path(self, key):
+        '''
+        Return the .npy file path for a cache key
+        '''
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        name = '{}-{}-{}.npy'.format(key[1], key[2], digest[:16])
+        return Path(self.directory).joinpath(name)
+
+    def load(self, matrix, key):
+        '''
+        Return values of a matrix from disk
+        or building it if it has not been stored
+        '''
+        if self.directory is not None:
+            path = self.path(key)
+            if path.exists():
+                return np.load(str(path))
+
+        values = matrix.get_values()
+
+        if self.directory is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write and rename, so other processes never read partial files
+            partial = path.with_suffix('.{}.tmp'.format(os.getpid()))
+            with open(str(partial), 'wb') as file:
+                np.save(file, values)
+            os.replace(str(partial), str(path))
+
+        return values
+
+    def __call__(self, matrix):
+        '''
+        Return values of an orthogonal matrix instance
+        '''
+        key = self.key(matrix)
+        try:
+            hash(key)
+        except TypeError:
+            # Unhashable parameters, matrix is not cached
+            return matrix.get_values()
+
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+        values = self.load(matrix, key)
+        # Cached values are shared between instances
+        values.flags.writeable = False
+
+        with self.lock:
+            self.entries[key] = values
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+        return values
+
+    def clear(self):
+        '''
+        Remove all matrices kept in memory
+        '''
+        with self.lock:
+            self.entries.clear()
+
+
+matrix_cache = MatrixCache(directory=os.environ.get('ALMIKY_MATRIX_CACHE'))
+
 
 class OrthogonalMatrix(Transform):
     r'''
@@ -72,19 +237,54 @@ class OrthogonalMatrix(Transform):
     with an specific parameters.
 
     For example: MatrixX(alpha=0.2, beta=0.3)
+
+    Matrix values are taken from "cache" class attribute
+    (see help(MatrixCache)), set it to None to always build them.
+
+    From "stable_dimension" on, values are computed with
+    get_stable_values method.
+
+    Each instance records:
+    quasi_orthogonal -- True if rounded M.T @ M and M @ M.T are identity
+    orthogonality_error -- Frobenius norm of M.T @ M - I
     '''
     orthogonal_form_class = None
+    cache = matrix_cache
+    stable_dimension = 64
 
     def __init__(self, dimension, **parameters):
         self.dimension = dimension
         self.parameters = parameters
-        matrix = self.get_values()
+        if self.cache is None:
+            matrix = self.get_values()
+        else:
+            matrix = self.cache(self)
+        self.audit(matrix)
         super().__init__(matrix)
 
     def ident(self, matrix):
         identity = np.identity(matrix.shape[0])
         return sum(sum(abs(np.around(np.dot(matrix.T, matrix))) - identity))
 
+    def audit(self, matrix):
+        '''
+        matrix.audit(values) => None, set quasi_orthogonal and
+        orthogonality_error attributes for matrix values.
+        Raise NotMatrixQuasiOrthogonal if values are not finite.
+        '''
+        if not np.all(np.isfinite(matrix)):
+            raise NotMatrixQuasiOrthogonal
+
+        identity = np.identity(matrix.shape[0])
+        left = np.dot(matrix.T, matrix)
+        right = np.dot(matrix, matrix.T)
+
+        self.orthogonality_error = np.linalg.norm(left - identity)
+        self.quasi_orthogonal = bool(
+            np.array_equal(np.around(left), identity) and
+            np.array_equal(np.around(right), identity)
+        )
+
     def get_column(self, order):
         form = self.orthogonal_form_class(order, **self.parameters)
         return np.array([form.eval(i) for i in range(self.dimension)])
@@ -93,16 +293,96 @@ class OrthogonalMatrix(Transform):
         '''
         matrix.get_values(dimension) => matrix, return all values of an
         ortogonal matrix of the dimension especified.
+        Raise NotMatrixQuasiOrthogonal if values are not finite, so
+        they are never cached.
         '''
-        matrix = np.empty((self.dimension, self.dimension))
-        indices = range(self.dimension)
-        for i in indices:
-            matrix[:, i] = self.get_column(order=i)
+        if self.dimension >= self.stable_dimension:
+            try:
+                return self.get_stable_values()
+            except NotImplementedError:
+                # Recurrence relation is unknown
+                pass
+
+        form = self.orthogonal_form_class(0, **self.parameters)
+        points = range(self.dimension)
+        orders = range(self.dimension)
+
+        # All orders are evaluated at once (see help(form.function))
+        table = form.function.eval_table(points, self.dimension - 1)
+        weights = np.array([float(form.weight(x)) for x in points])
+        norms = np.array([float(form.function.norm(n)) for n in orders])
+        matrix = table * np.sqrt(weights[:, np.newaxis] / norms)
+        if not np.all(np.isfinite(matrix)):
+            raise NotMatrixQuasiOrthogonal
+
+        return matrix
+
+    def get_stable_values(self):
+        '''
+        matrix.get_stable_values() => matrix, return all values of an
+        ortogonal matrix for large dimensions (up to 1024).
+
+        Columns are computed with the weighted recurrence relation of
+        the orthogonal function: each column is built from the two
+        previous ones and renormalised to unit norm, so values never
+        overflow. Each column is re-orthogonalised against previous
+        columns (Gram-Schmidt, twice), so float64 rounding and
+        cancellation do not break down the orthogonality. If a column
+        vanishes, it is replaced by the unit vector of the point less
+        represented in previous columns.
+
+        Raise NotMatrixQuasiOrthogonal if a column is still not
+        orthogonal to previous ones or values are not finite.
+
+        For weights with infinite support (Charlier, q-Charlier)
+        columns are orthonormal on the dimension points.
+        '''
+        form = self.orthogonal_form_class(0, **self.parameters)
+        points = np.arange(self.dimension, dtype=float)
+        log_weights = np.array([form.log_weight(x) for x in points])
+        tolerance = np.finfo(float).eps * self.dimension
+
+        matrix = np.zeros((self.dimension, self.dimension))
+        column = np.exp((log_weights - log_weights.max()) / 2)
+        matrix[:, 0] = column / np.linalg.norm(column)
+        # Ratio between norm of previous and current weighted polynomial
+        ratio = 0
+
+        for order in range(1, self.dimension):
+            a, b = form.function.recurrence(points, order - 1)
+            column = a * matrix[:, order - 1]
+            if ratio:
+                column += b * ratio * matrix[:, order - 2]
+
+            previous = matrix[:, :order]
+            norm = np.linalg.norm(column)
+            # Classical Gram-Schmidt, always twice (CGS2): a residual
+            # left by cancellation is orthogonalised again
+            for _ in range(2):
+                column -= np.dot(previous, np.dot(previous.T, column))
+
+            residual = np.linalg.norm(column)
+            if not residual > tolerance * norm:
+                # Breakdown: column lies in the span of previous columns
+                coverage = np.sum(previous ** 2, axis=1)
+                column = np.zeros(self.dimension)
+                column[np.argmin(coverage)] = 1
+                for _ in range(2):
+                    column -= np.dot(previous, np.dot(previous.T, column))
+                residual = np.linalg.norm(column)
+                ratio = 0
+            else:
+                ratio = 1 / residual
+
+            column = column / residual
+            if not np.abs(np.dot(previous.T, column)).max() <= \
+                    np.sqrt(tolerance):
+                raise NotMatrixQuasiOrthogonal
+            matrix[:, order] = column
+
+        if not np.all(np.isfinite(matrix)):
+            raise NotMatrixQuasiOrthogonal
 
-        self.quasi_orthogonal = (
-            self.ident(matrix) == 0 and
-            self.ident(matrix.T) == 0
-        )
         return matrix
 
 
@@ -7,6 +7,8 @@ Each ortogonal form is defined in a class and depend of an ortogonal function.
 '''
 
 import math
+
+import numpy as np
 from almiky.moments.functions import (
     CharlierFunction, CharlierSobolevFunction, QHahnFunction,
     QKrawtchoukFunction, TchebichefFunction, QCharlierFunction)
@@ -14,6 +16,30 @@ from mpmath import qp, mp
 from scipy import special
 
 
+def log_qpochhammer(c, q, n, shift=0):
+    '''
+    log_qpochhammer(c, q, n, shift) => double, return natural logarithm
+    of |(c q^shift; q)_n| (absolute value of q-Pochhammer symbol).
+
+    Each factor 1 - c q^(k + shift) is evaluated in log space, so
+    large q^shift (e.g. q^-N) does not overflow. Return -inf if a
+    factor is zero.
+    '''
+    if c == 0 or n <= 0:
+        return 0.0
+
+    exponents = np.arange(n) + shift
+    log_terms = math.log(abs(c)) + exponents * math.log(q)
+    sign = math.copysign(1, c)
+    with np.errstate(divide='ignore'):
+        # log|1 - t| for |t| < 1, log|t| + log|1 - 1/t| otherwise
+        small = np.log1p(-sign * np.exp(np.minimum(log_terms, 0)))
+        large = log_terms + np.log(
+            np.abs(1 - sign * np.exp(-np.maximum(log_terms, 0))))
+
+    return float(np.sum(np.where(log_terms < 0, small, large)))
+
+
 class OrthogonalForm:
     r'''
     Abstract class that represent an orthogonal form.
@@ -57,6 +83,14 @@ class OrthogonalForm:
         '''
         raise NotImplementedError
 
+    def log_weight(self, x):
+        '''
+        from.log_weight(x) => double, return natural logarithm of weight
+        function absolute value in x. Forms whose weight overflows for
+        large x override it with a log-space formula.
+        '''
+        return float(mp.log(abs(self.weight(x))))
+
 
 class CharlierForm(OrthogonalForm):
     '''
@@ -72,6 +106,9 @@ class CharlierForm(OrthogonalForm):
     def weight(self, x):
         return math.exp(-self.alpha) * self.alpha ** x / math.factorial(x)
 
+    def log_weight(self, x):
+        return -self.alpha + x * math.log(self.alpha) - math.lgamma(x + 1)
+
 
 class CharlierSobolevForm(CharlierForm):
     '''
@@ -105,6 +142,16 @@ class QHahnForm(OrthogonalForm):
             qp(self.beta ** -1 * self.q ** -self.N, self.q, x) ** -1
         )
 
+    def log_weight(self, x):
+        x = int(x)
+        return (
+            log_qpochhammer(self.alpha, self.q, x, shift=1) +
+            log_qpochhammer(1, self.q, x, shift=-self.N) -
+            x * math.log(abs(self.alpha * self.beta * self.q)) -
+            log_qpochhammer(1, self.q, x, shift=1) -
+            log_qpochhammer(1 / self.beta, self.q, x, shift=-self.N)
+        )
+
 
 class QKrawtchoukForm(OrthogonalForm):
     '''
@@ -127,6 +174,14 @@ class QKrawtchoukForm(OrthogonalForm):
             (-self.p) ** -x
         )
 
+    def log_weight(self, x):
+        x = int(x)
+        return (
+            log_qpochhammer(1, self.q, x, shift=-self.N) -
+            log_qpochhammer(1, self.q, x, shift=1) -
+            x * math.log(abs(self.p))
+        )
+
 
 class TchebichefForm(OrthogonalForm):
     '''
@@ -137,6 +192,9 @@ class TchebichefForm(OrthogonalForm):
     def weight(self, x):
         return 1
 
+    def log_weight(self, x):
+        return 0.0
+
 
 class QCharlierForm(OrthogonalForm):
     '''
@@ -157,3 +215,11 @@ class QCharlierForm(OrthogonalForm):
             qp(self.q, self.q, x) *
             self.q ** special.binom(x, 2)
         )
+
+    def log_weight(self, x):
+        x = int(x)
+        return (
+            x * math.log(abs(self.a)) -
+            log_qpochhammer(1, self.q, x, shift=1) +
+            special.binom(x, 2) * math.log(self.q)
+        )
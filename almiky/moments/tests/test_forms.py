@@ -88,6 +88,30 @@ class QHahnOrtogonalFormsTest(unittest.TestCase):
 
         np.testing.assert_almost_equal(value, 0.00166052, 8)
 
+    def test_log_weight(self):
+        '''
+        Log-space weights of q-forms match their weights
+        '''
+        from almiky.moments.orthogonal_forms import (
+            QCharlierForm, QHahnForm, QKrawtchoukForm)
+
+        forms = (
+            QHahnForm(0, q=0.5, alpha=0.5, beta=0.5, N=16),
+            QKrawtchoukForm(0, q=0.75, p=0.7, N=16),
+            QCharlierForm(0, a=2, q=0.6),
+        )
+        for form in forms:
+            for x in range(16):
+                np.testing.assert_almost_equal(
+                    form.log_weight(x), np.log(abs(float(form.weight(x)))))
+
+    def test_log_weight_does_not_overflow(self):
+        from almiky.moments.orthogonal_forms import QHahnForm
+
+        form = QHahnForm(0, q=0.5, alpha=0.5, beta=0.5, N=1023)
+
+        self.assertTrue(np.isfinite(form.log_weight(1023)))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -197,5 +197,79 @@ class QHahnFunctionsTest(unittest.TestCase):
         self.assertEqual(value, 0)
 
 
+class EvalTableTest(unittest.TestCase):
+    '''
+    Tests to verify the evaluation of ortogonal functions for all
+    orders using recurrence relations
+    '''
+
+    def assertTable(self, func, dimension):
+        expected = np.array([
+            [float(func.eval(x, order)) for order in range(dimension)]
+            for x in range(dimension)
+        ])
+
+        table = func.eval_table(range(dimension), dimension - 1)
+
+        self.assertEqual(table.shape, (dimension, dimension))
+        # Relative error to the greatest value of each order
+        np.testing.assert_array_almost_equal(
+            table / np.abs(expected).max(axis=0),
+            expected / np.abs(expected).max(axis=0)
+        )
+
+    def test_charlier(self):
+        from almiky.moments.functions import CharlierFunction
+
+        self.assertTable(CharlierFunction(alpha=5), 8)
+
+    def test_charlier_sobolev(self):
+        from almiky.moments.functions import CharlierSobolevFunction
+
+        func = CharlierSobolevFunction(alpha=0.5, beta=10, gamma=-2)
+        self.assertTable(func, 4)
+
+    def test_tchebichef(self):
+        from almiky.moments.functions import TchebichefFunction
+
+        self.assertTable(TchebichefFunction(N=8), 8)
+
+    def test_qkrawtchouk(self):
+        from almiky.moments.functions import QKrawtchoukFunction
+
+        self.assertTable(QKrawtchoukFunction(p=0.7, q=0.75, N=7), 8)
+        self.assertTable(QKrawtchoukFunction(p=707, q=0.77, N=7), 8)
+
+    def test_qhahn(self):
+        from almiky.moments.functions import QHahnFunction
+
+        self.assertTable(QHahnFunction(q=0.5, alpha=0.5, beta=0.5, N=7), 8)
+
+    def test_qcharlier(self):
+        from mpmath import qp
+        from almiky.moments.functions import QCharlierFunction
+
+        a, q, dimension = 0.7, 0.6, 8
+
+        def evaluate(x, order):
+            # Terminating 2phi1(q^-n, q^-x; 0; q; -q^(n+1)/a) series
+            z = -q ** (order + 1) / a
+            return float(sum(
+                qp(q ** -order, q, k) * qp(q ** -x, q, k) /
+                qp(q, q, k) * z ** k
+                for k in range(order + 1)
+            ))
+
+        expected = np.array([
+            [evaluate(x, order) for order in range(dimension)]
+            for x in range(dimension)
+        ])
+
+        func = QCharlierFunction(a=a, q=q)
+        table = func.eval_table(range(dimension), dimension - 1)
+
+        np.testing.assert_array_almost_equal(table, expected)
+
+
 if __name__ == '__main__':
     unittest.main()
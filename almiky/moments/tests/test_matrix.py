@@ -1,8 +1,9 @@
 # -*- encoding:utf-8 -*-
 # -*- coding:utf-8 -*-
 
+import tempfile
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import numpy as np
 
@@ -64,6 +65,64 @@ class ImageTransform(unittest.TestCase):
         # transform.direct.assert_called()
         np.testing.assert_equal(itransform.inverse(data), expected)
 
+    def test_inverse_blocks(self):
+        inverse = np.array([
+            [[-1.8, 0], [58.78, 255.1]],
+            [[255.0, 12.5], [52.17, 3.49]]
+        ])
+        data = np.random.rand(2, 2, 2)
+        expected = np.array([
+            [[0, 0], [59, 255]],
+            [[255, 12], [52, 3]]
+        ])
+        # Base transform mock
+        transform = Mock()
+        transform.inverse_blocks = Mock(return_value=inverse)
+
+        itransform = matrix.ImageTransform(transform)
+
+        np.testing.assert_equal(itransform.inverse_blocks(data), expected)
+
+
+class SeparableTransformTest(unittest.TestCase):
+
+    def test_direct_blocks(self):
+        left = np.random.rand(4, 4)
+        right = np.random.rand(4, 4)
+        blocks = np.random.rand(5, 4, 4)
+        transform = matrix.SeparableTransform(left, right)
+
+        expected = [transform.direct(block) for block in blocks]
+
+        np.testing.assert_array_almost_equal(
+            transform.direct_blocks(blocks), expected)
+
+    def test_inverse_blocks(self):
+        left = np.random.rand(4, 4)
+        right = np.random.rand(4, 4)
+        blocks = np.random.rand(5, 4, 4)
+        transform = matrix.SeparableTransform(left, right)
+
+        expected = [transform.inverse(block) for block in blocks]
+
+        np.testing.assert_array_almost_equal(
+            transform.inverse_blocks(blocks), expected)
+
+    def test_blocks_grid(self):
+        '''
+        Blocks can be given in a grid with shape (rows, cols, N, N)
+        '''
+        ortho_matrix = np.linalg.qr(np.random.rand(4, 4))[0]
+        blocks = np.random.rand(3, 2, 4, 4)
+        transform = matrix.Transform(ortho_matrix)
+
+        direct = transform.direct_blocks(blocks)
+
+        np.testing.assert_array_almost_equal(
+            direct[2, 1], transform.direct(blocks[2, 1]))
+        np.testing.assert_array_almost_equal(
+            transform.inverse_blocks(direct), blocks)
+
 
 class OrtogonalMatrixTest(unittest.TestCase):
 
@@ -84,6 +143,100 @@ class OrtogonalMatrixTest(unittest.TestCase):
                 "OrthogonalMatrix derivated class without 'keval' method"
 
 
+class MatrixCacheTest(unittest.TestCase):
+
+    def test_values_are_reused(self):
+        from almiky.moments.matrix import CharlierMatrix
+
+        cache = matrix.MatrixCache()
+
+        with patch.object(CharlierMatrix, 'cache', cache):
+            first = CharlierMatrix(2, alpha=5)
+            with patch.object(CharlierMatrix, 'get_values') as get_values:
+                second = CharlierMatrix(2, alpha=5)
+                get_values.assert_not_called()
+
+        self.assertIs(first.transform.l_orthon_matrix,
+                      second.transform.l_orthon_matrix)
+        self.assertEqual(first.quasi_orthogonal, second.quasi_orthogonal)
+        self.assertFalse(first.transform.l_orthon_matrix.flags.writeable)
+
+    def test_key(self):
+        from almiky.moments.matrix import CharlierMatrix, QHahnMatrix
+
+        cache = matrix.MatrixCache()
+
+        with patch.object(CharlierMatrix, 'cache', cache):
+            CharlierMatrix(2, alpha=5)
+            CharlierMatrix(2, alpha=6)
+            CharlierMatrix(3, alpha=5)
+            QHahnMatrix(2, q=0.5, alpha=0.5, beta=0.5, N=2)
+            QHahnMatrix(2, N=2, beta=0.5, alpha=0.5, q=0.5)
+
+        self.assertEqual(len(cache.entries), 4)
+
+    def test_key_version(self):
+        from almiky.moments.matrix import CharlierMatrix
+
+        cache = matrix.MatrixCache(directory='matrices')
+        with patch.object(CharlierMatrix, 'cache', None):
+            instance = CharlierMatrix(2, alpha=5)
+        key = cache.key(instance)
+
+        # Overridden stable dimension
+        with patch.object(CharlierMatrix, 'stable_dimension', 2):
+            self.assertNotEqual(cache.key(instance), key)
+
+        # Files stored by other versions are not used
+        with patch.object(matrix.MatrixCache, 'version', 1):
+            self.assertNotEqual(cache.key(instance), key)
+            self.assertNotEqual(cache.path(cache.key(instance)),
+                                cache.path(key))
+
+    def test_lru_eviction(self):
+        from almiky.moments.matrix import CharlierMatrix
+
+        cache = matrix.MatrixCache(maxsize=2)
+
+        with patch.object(CharlierMatrix, 'cache', cache):
+            CharlierMatrix(2, alpha=1)
+            CharlierMatrix(2, alpha=2)
+            # alpha=1 is the most recently used
+            CharlierMatrix(2, alpha=1)
+            CharlierMatrix(2, alpha=3)
+
+        alphas = [dict(key[3])['alpha'] for key in cache.entries]
+        self.assertEqual(alphas, [1, 3])
+
+    def test_directory(self):
+        from almiky.moments.matrix import CharlierMatrix
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = matrix.MatrixCache(directory=directory)
+            with patch.object(CharlierMatrix, 'cache', cache):
+                expected = CharlierMatrix(2, alpha=5).get_values()
+
+            # Other process (empty memory cache)
+            cache = matrix.MatrixCache(directory=directory)
+            with patch.object(CharlierMatrix, 'cache', cache):
+                with patch.object(CharlierMatrix, 'get_values') as get_values:
+                    values = CharlierMatrix(2, alpha=5)
+                    get_values.assert_not_called()
+
+        np.testing.assert_array_equal(
+            values.transform.l_orthon_matrix, expected)
+
+    def test_without_cache(self):
+        from almiky.moments.matrix import CharlierMatrix
+
+        with patch.object(CharlierMatrix, 'cache', None):
+            first = CharlierMatrix(2, alpha=5)
+            second = CharlierMatrix(2, alpha=5)
+
+        self.assertIsNot(first.transform.l_orthon_matrix,
+                         second.transform.l_orthon_matrix)
+
+
 class CharlierMatrixTest(unittest.TestCase):
 
     def test_matrix(self):
@@ -155,6 +308,37 @@ class QHahnMatrixTest(unittest.TestCase):
             ])
         )
 
+    def test_large_dimension(self):
+        '''
+        Columns are orthogonal although the recurrence cancels out
+        '''
+        from almiky.moments.matrix import QHahnMatrix
+
+        with patch.object(QHahnMatrix, 'cache', None):
+            matrix = QHahnMatrix(128, q=0.5, alpha=0.5, beta=0.5, N=127)
+
+        self.assertTrue(matrix.quasi_orthogonal)
+        self.assertLess(matrix.orthogonality_error, 1e-10)
+
+    def test_non_finite_values(self):
+        from almiky.exceptions import NotMatrixQuasiOrthogonal
+        from almiky.moments.matrix import QHahnMatrix
+        from almiky.moments.orthogonal_forms import QHahnForm
+
+        with patch.object(QHahnMatrix, 'cache', None), \
+                patch.object(QHahnForm, 'log_weight', return_value=np.nan):
+            with self.assertRaises(NotMatrixQuasiOrthogonal):
+                QHahnMatrix(64, q=0.5, alpha=0.5, beta=0.5, N=63)
+
+    def test_audit_non_finite_values(self):
+        from almiky.exceptions import NotMatrixQuasiOrthogonal
+        from almiky.moments.matrix import QHahnMatrix
+
+        matrix = QHahnMatrix(2, q=0.5, alpha=0.5, beta=0.5, N=2)
+
+        with self.assertRaises(NotMatrixQuasiOrthogonal):
+            matrix.audit(np.array([[np.nan, 0], [0, 1]]))
+
 
 class QKrawtchoukMatrixTest(unittest.TestCase):
 
@@ -194,6 +378,68 @@ class QKrawtchoukMatrixTest(unittest.TestCase):
             ])
         )
 
+    def test_stable_values(self):
+        from almiky.moments.matrix import QKrawtchoukMatrix
+
+        matrix = QKrawtchoukMatrix(8, p=0.7, q=0.75)
+
+        np.testing.assert_array_almost_equal(
+            matrix.get_stable_values(), matrix.get_values())
+
+
+class TchebichefMatrixTest(unittest.TestCase):
+
+    def test_matrix(self):
+        from almiky.moments.matrix import TchebichefMatrix
+        from almiky.moments.transform import TCHEBICHEF
+
+        matrix = TchebichefMatrix(8, N=8)
+
+        np.testing.assert_array_almost_equal(matrix.get_values(), TCHEBICHEF)
+        self.assertTrue(matrix.quasi_orthogonal)
+
+    def test_matrix_from_columns(self):
+        '''
+        All orders evaluated at once match single column evaluation
+        '''
+        from almiky.moments.matrix import TchebichefMatrix
+
+        matrix = TchebichefMatrix(16, N=16)
+        columns = np.array([matrix.get_column(i) for i in range(16)])
+
+        np.testing.assert_array_almost_equal(
+            matrix.get_values(), columns.T.astype(float))
+
+    def test_stable_values(self):
+        from almiky.moments.matrix import TchebichefMatrix
+        from almiky.moments.transform import TCHEBICHEF
+
+        matrix = TchebichefMatrix(8, N=8)
+
+        np.testing.assert_array_almost_equal(
+            matrix.get_stable_values(), TCHEBICHEF)
+
+    def test_large_dimension(self):
+        '''
+        Stable values match single column evaluation
+        '''
+        from almiky.moments.matrix import TchebichefMatrix
+
+        matrix = TchebichefMatrix(64, N=64)
+        columns = np.array([matrix.get_column(i) for i in range(64)])
+
+        np.testing.assert_array_almost_equal(
+            matrix.get_values(), columns.T.astype(float))
+        self.assertLess(matrix.orthogonality_error, 1e-10)
+
+    def test_orthogonality_audit(self):
+        from almiky.moments.matrix import TchebichefMatrix
+
+        matrix = TchebichefMatrix(256, N=256)
+
+        self.assertTrue(matrix.quasi_orthogonal)
+        self.assertLess(matrix.orthogonality_error, 1e-10)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,8 @@
 
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 
 class Quantizer(ABC):
     ''''
@@ -22,3 +24,17 @@ class Quantizer(ABC):
         Returns:
             quantizer value
         '''
+
+    def quantize_many(self, amplitudes):
+        '''
+        Quantize an array of amplitudes. Quantizers should
+        override this method with a vectorized version,
+        default implementation calls the quantizer for each amplitude.
+
+        Args:
+            amplitudes (array_like): amplitudes of signal
+
+        Returns:
+            numpy array: quantized values
+        '''
+        return np.vectorize(self, otypes=[float])(amplitudes)
@@ -1,5 +1,7 @@
 '''Scalar quantization module'''
 
+import numpy as np
+
 from almiky.quantization import Quantizer
 
 
@@ -33,3 +35,15 @@ class UniformQuantizer(Quantizer):
             quantizer value
         '''
         return self.step * round(amplitude / self.step)
+
+    def quantize_many(self, amplitudes):
+        '''
+        Quantize an array of amplitudes
+
+        Args:
+            amplitudes (array_like): amplitudes of signal
+
+        Returns:
+            numpy array: quantized values
+        '''
+        return self.step * np.rint(np.asarray(amplitudes) / self.step)
@@ -2,6 +2,8 @@
 
 from unittest import TestCase
 
+import numpy as np
+
 from almiky.quantization import scalar
 
 
@@ -25,3 +27,12 @@ class UniformQuantizationTest(TestCase):
         self.assertEqual(quantize(2.4), 0)
         self.assertEqual(quantize(7.6), 10)
         self.assertEqual(quantize(-8.2), -10)
+
+    def test_quantize_many(self):
+        quantize = scalar.UniformQuantizer(5)
+        amplitudes = np.array([0, 5.5, 5.8, 1.5, 2.4, 2.5, 7.5, 7.6, -8.2])
+
+        np.testing.assert_array_equal(
+            quantize.quantize_many(amplitudes),
+            [quantize(amplitude) for amplitude in amplitudes]
+        )
@@ -0,0 +1,199 @@
+'''
+On-disk cache of image features
+'''
+
+import hashlib
+import os
+import sqlite3
+
+import numpy as np
+
+# Bytes read at once when files are hashed
+HASH_BLOCK = 1 << 20
+
+
+def extractor_id(extractor):
+    '''
+    extractor_id(extractor) => (str, str): return name and version of
+    a feature extractor, from its (name) and (version) attributes or
+    its class. Features cached by an extractor are not used by other
+    extractors or other versions of it.
+    '''
+    kind = type(extractor)
+    name = getattr(
+        extractor, 'name', '{}.{}'.format(kind.__module__, kind.__qualname__))
+
+    return str(name), str(getattr(extractor, 'version', ''))
+
+
+class FeatureCache:
+    '''
+    Features of image files stored in a SQLite database, so images are
+    decoded and processed only once:
+
+    cache = FeatureCache('features.sqlite', max_size=1 << 30)
+    load = ProcessImageFolder(extractor, cache=cache)
+
+    Files are identified by device, inode, modification time and size,
+    or by SHA-256 hash of their content if strict is True (files are
+    read but not decoded). Least recently used features are evicted
+    when stored features exceed max_size bytes.
+    '''
+
+    def __init__(self, path, strict=False, max_size=None, commit_every=1000):
+        '''
+        Initialize self. See help(type(self)) for accurate signature.
+
+        Arguments:
+        path -- database file path
+        strict -- identify files by content hash (default is False)
+        max_size -- max bytes of features stored (default is None:
+            unbounded)
+        commit_every -- number of changes written at once
+            (default is 1000)
+        '''
+        self.path = str(path)
+        self.strict = strict
+        self.max_size = max_size
+        self.commit_every = commit_every
+        self._changes = 0
+
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS features ('
+            'extractor TEXT, version TEXT, key TEXT, dtype TEXT, '
+            'value BLOB, size INTEGER, accessed INTEGER, '
+            'PRIMARY KEY (extractor, version, key))'
+        )
+        self.connection.execute(
+            'CREATE INDEX IF NOT EXISTS features_accessed '
+            'ON features (accessed)'
+        )
+        self.size, self._clock = self.connection.execute(
+            'SELECT COALESCE(SUM(size), 0), COALESCE(MAX(accessed), 0) '
+            'FROM features'
+        ).fetchone()
+
+    def key(self, file):
+        '''
+        obj.key(file) => str: return key identifying a file
+        '''
+        if self.strict:
+            digest = hashlib.sha256()
+            with open(str(file), 'rb') as data:
+                for block in iter(lambda: data.read(HASH_BLOCK), b''):
+                    digest.update(block)
+            return digest.hexdigest()
+
+        stat = os.stat(str(file))
+        return '{}:{}:{}:{}'.format(
+            stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def _changed(self):
+        self._changes += 1
+        if self._changes >= self.commit_every:
+            self.commit()
+
+    def get(self, file, extractor, key=None):
+        '''
+        obj.get(file, extractor) => numpy array: return features of
+        file computed by extractor, None if they are not cached.
+        Key of file (see help(self.key)) can be given to avoid
+        computing it again, e.g. hashing the file in strict mode.
+        '''
+        name, version = extractor_id(extractor)
+        if key is None:
+            key = self.key(file)
+        row = self.connection.execute(
+            'SELECT dtype, value FROM features '
+            'WHERE extractor = ? AND version = ? AND key = ?',
+            (name, version, key)
+        ).fetchone()
+        if row is None:
+            return None
+
+        self.connection.execute(
+            'UPDATE features SET accessed = ? '
+            'WHERE extractor = ? AND version = ? AND key = ?',
+            (self._tick(), name, version, key)
+        )
+        self._changed()
+
+        return np.frombuffer(row[1], dtype=row[0]).copy()
+
+    def set(self, file, extractor, value, key=None):
+        '''
+        obj.set(file, extractor, value) => None: cache features of file
+        computed by extractor. Key of file can be given, see
+        help(self.get).
+        '''
+        name, version = extractor_id(extractor)
+        if key is None:
+            key = self.key(file)
+        value = np.ascontiguousarray(value).reshape(-1)
+        data = value.tobytes()
+
+        old = self.connection.execute(
+            'SELECT size FROM features '
+            'WHERE extractor = ? AND version = ? AND key = ?',
+            (name, version, key)
+        ).fetchone()
+        self.connection.execute(
+            'INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (name, version, key, value.dtype.str, data, len(data),
+             self._tick())
+        )
+        self.size += len(data) - (old[0] if old else 0)
+        self._changed()
+
+        if self.max_size is not None and self.size > self.max_size:
+            self.evict(self.max_size)
+
+    def evict(self, size):
+        '''
+        obj.evict(size) => None: remove least recently used features
+        until stored features take at most (size) bytes.
+        '''
+        excess = self.size - size
+        if excess <= 0:
+            return
+
+        rows = []
+        freed = 0
+        cursor = self.connection.execute(
+            'SELECT rowid, size FROM features ORDER BY accessed')
+        for rowid, row_size in cursor:
+            if freed >= excess:
+                break
+            rows.append((rowid,))
+            freed += row_size
+        cursor.close()
+
+        self.connection.executemany(
+            'DELETE FROM features WHERE rowid = ?', rows)
+        self.size -= freed
+        self.commit()
+
+    def commit(self):
+        '''
+        obj.commit() => None: write pending changes
+        '''
+        self.connection.commit()
+        self._changes = 0
+
+    def close(self):
+        '''
+        obj.close() => None: write pending changes and close database
+        '''
+        self.commit()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
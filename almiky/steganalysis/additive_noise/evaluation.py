@@ -0,0 +1,222 @@
+'''
+Evaluation of the additive noise detector.
+
+Distances of items (see help(model.AdditiveNoiseEstimator.distance))
+are computed once and sorted, so metrics of every threshold are
+computed with one sweep in O(n log n):
+
+scores = estimator.distance(data)
+fpr, tpr, thresholds = evaluation.roc_curve(scores, positives)
+threshold, value = evaluation.best_threshold(scores, positives)
+
+Positives are stego items: an item is classified as stego (predicted
+-1 by the estimator) if its distance is greater than or equal to
+the threshold.
+'''
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Resamples computed by each bootstrap task
+BOOTSTRAP_CHUNK = 100
+
+BootstrapInterval = namedtuple(
+    'BootstrapInterval', ['estimate', 'low', 'high'])
+BootstrapInterval.__doc__ = '''
+Bootstrap confidence interval of a statistic:
+estimate -- statistic of the whole sample
+low -- lower bound of interval
+high -- upper bound of interval
+'''
+
+
+def sweep(scores, positives):
+    '''
+    sweep(scores, positives) => (thresholds, tp, fp): return distinct
+    scores in decreasing order and number of true positives and false
+    positives when items with score greater than or equal to each
+    threshold are classified as positives.
+
+    Arguments:
+    scores -- distances of items
+    positives -- True (or 1) for positive items
+    '''
+    scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+    positives = np.asarray(positives, dtype=bool).reshape(-1)
+    if scores.shape != positives.shape:
+        raise ValueError('Scores and labels must have the same length')
+
+    order = np.argsort(scores, kind='stable')[::-1]
+    scores = scores[order]
+    # Last item of each group of equal scores
+    ends = np.append(np.flatnonzero(np.diff(scores)), scores.size - 1)
+    tp = np.cumsum(positives[order], dtype=np.int64)[ends]
+    fp = ends + 1 - tp
+
+    return scores[ends], tp, fp
+
+
+def _totals(tp, fp):
+    positives, negatives = tp[-1], fp[-1]
+    if not positives or not negatives:
+        raise ValueError('Positive and negative items are required')
+
+    return positives, negatives
+
+
+def roc_curve(scores, positives):
+    '''
+    roc_curve(scores, positives) => (fpr, tpr, thresholds): return
+    receiver operating characteristic (ROC) curve. First point
+    (threshold is infinite) classifies all items as negatives.
+    See help(sweep).
+    '''
+    thresholds, tp, fp = sweep(scores, positives)
+    total_positives, total_negatives = _totals(tp, fp)
+
+    return (
+        np.append(0, fp) / total_negatives,
+        np.append(0, tp) / total_positives,
+        np.append(np.inf, thresholds),
+    )
+
+
+def precision_recall_curve(scores, positives):
+    '''
+    precision_recall_curve(scores, positives) => (precision, recall,
+    thresholds): return precision-recall curve, recall is increasing.
+    See help(sweep).
+    '''
+    thresholds, tp, fp = sweep(scores, positives)
+    total_positives, _ = _totals(tp, fp)
+
+    return tp / (tp + fp), tp / total_positives, thresholds
+
+
+def auc(x, y):
+    '''
+    auc(x, y) => float: return area under a curve (trapezoidal rule),
+    x must be monotonic.
+    '''
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    return float(abs(np.sum(np.diff(x) * (y[1:] + y[:-1]) / 2)))
+
+
+def roc_auc(scores, positives):
+    '''
+    roc_auc(scores, positives) => float: return area under ROC curve,
+    probability of a positive item having a greater score than a
+    negative item (ties count one half).
+    '''
+    fpr, tpr, _ = roc_curve(scores, positives)
+    return auc(fpr, tpr)
+
+
+def average_precision(scores, positives):
+    '''
+    average_precision(scores, positives) => float: return area under
+    precision-recall curve as mean of precision weighted by recall
+    increments.
+    '''
+    precision, recall, _ = precision_recall_curve(scores, positives)
+    return float(np.sum(np.diff(recall, prepend=0) * precision))
+
+
+def best_threshold(scores, positives, criterion='youden'):
+    '''
+    best_threshold(scores, positives, criterion) => (float, float):
+    return the threshold maximizing a criterion and its value.
+
+    Arguments:
+    scores -- distances of items
+    positives -- True (or 1) for positive items
+    criterion -- 'youden' (tpr - fpr), 'accuracy' or 'f1'
+        (default is 'youden')
+    '''
+    thresholds, tp, fp = sweep(scores, positives)
+    total_positives, total_negatives = _totals(tp, fp)
+
+    if criterion == 'youden':
+        values = tp / total_positives - fp / total_negatives
+    elif criterion == 'accuracy':
+        values = (tp + total_negatives - fp) / (
+            total_positives + total_negatives)
+    elif criterion == 'f1':
+        values = 2 * tp / (tp + fp + total_positives)
+    else:
+        raise ValueError('Unknown criterion: {}'.format(criterion))
+
+    best = int(np.argmax(values))
+    return float(thresholds[best]), float(values[best])
+
+
+def _bootstrap_task(scores, positives, statistic, seed, samples):
+    '''
+    Return statistic of (samples) resamples of items, nan if a
+    resample is not valid (e.g. it has only one class).
+    '''
+    generator = np.random.default_rng(seed)
+    values = np.empty(samples)
+    for sample in range(samples):
+        index = generator.integers(0, len(scores), len(scores))
+        try:
+            values[sample] = statistic(scores[index], positives[index])
+        except ValueError:
+            values[sample] = np.nan
+
+    return values
+
+
+def bootstrap(scores, positives, statistic=roc_auc, samples=1000,
+              confidence=0.95, seed=None, workers=None):
+    '''
+    bootstrap(scores, positives) => BootstrapInterval: return
+    percentile bootstrap confidence interval of a statistic
+    (default is roc_auc).
+
+    Resamples are computed in chunks by a pool of processes if workers
+    is given (statistic must be picklable). Chunks have their own
+    seeds, spawned from (seed), so intervals are the same for any
+    number of workers.
+
+    Arguments:
+    scores -- distances of items
+    positives -- True (or 1) for positive items
+    statistic -- callable(scores, positives) => float
+    samples -- number of resamples (default is 1000)
+    confidence -- confidence level (default is 0.95)
+    seed -- random seed (default is None)
+    workers -- number of processes, None to compute resamples in this
+        process (default is None)
+    '''
+    scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+    positives = np.asarray(positives, dtype=bool).reshape(-1)
+
+    sizes = [
+        min(BOOTSTRAP_CHUNK, samples - start)
+        for start in range(0, samples, BOOTSTRAP_CHUNK)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [
+        (scores, positives, statistic, task_seed, size)
+        for task_seed, size in zip(seeds, sizes)
+    ]
+
+    if workers is None:
+        values = [_bootstrap_task(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            values = list(pool.map(_bootstrap_task, *zip(*tasks)))
+
+    values = np.concatenate(values)
+    alpha = (1 - confidence) / 2
+
+    return BootstrapInterval(
+        estimate=statistic(scores, positives),
+        low=float(np.nanquantile(values, alpha)),
+        high=float(np.nanquantile(values, 1 - alpha)),
+    )
@@ -1,3 +1,7 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
 import imageio
 
 
@@ -5,17 +9,121 @@ class ProcessImageFolder:
     '''
     Extract features of images from a folder
     using self.extractor
+
+    Images are processed one by one:
+    load = ProcessImageFolder(extractor)
+
+    or in parallel, decoding images in a pool of I/O threads and
+    extracting features in a pool of processes (extractor must
+    be picklable):
+    load = ProcessImageFolder(extractor, workers=4, io_threads=2)
+
+    In both cases features are generated in folder.iterdir() order.
+
+    Features can be cached (see help(cache.FeatureCache)), images whose
+    features are cached are not decoded:
+    load = ProcessImageFolder(extractor, cache=FeatureCache(path))
     '''
 
-    def __init__(self, extractor):
+    def __init__(self, extractor, workers=None, io_threads=2, prefetch=None,
+                 cache=None):
+        '''
+        Initialize self. See help(type(self)) for accurate signature.
+
+        Arguments:
+        extractor -- callable returning features of an image
+        workers -- number of processes, None to process images one by
+            one (default is None)
+        io_threads -- number of threads decoding images (default is 2)
+        prefetch -- max number of images decoded or processed ahead
+            (default is 2 * workers)
+        cache -- FeatureCache (default is None: no cache)
+        '''
         self.extractor = extractor
+        self.workers = workers
+        self.io_threads = io_threads
+        self.prefetch = prefetch
+        self.cache = cache
+
+    def _read(self, file):
+        return imageio.imread(str(file))
+
+    def _cached(self, file):
+        '''
+        Return (key, cached features) of file, features are None if
+        they are not cached. Key is computed once (strict caches hash
+        files) and it is used again to store features.
+        '''
+        if self.cache is None:
+            return None, None
+        key = self.cache.key(file)
+        return key, self.cache.get(file, self.extractor, key=key)
+
+    def _store(self, file, key, value):
+        if self.cache is not None:
+            self.cache.set(file, self.extractor, value, key=key)
 
     def _process(self, file):
-        image = imageio.imread(str(file))
+        key, value = self._cached(file)
+        if value is not None:
+            return value
+
+        image = self._read(file)
         value = self.extractor(image)
+        self._store(file, key, value)
         return value
 
+    def _submit_read(self, readers, file):
+        '''
+        Return (file, key, cached features, None) if features of file
+        are cached, (file, key, None, future of image) otherwise.
+        '''
+        key, cached = self._cached(file)
+        if cached is not None:
+            return file, key, cached, None
+
+        return file, key, None, readers.submit(self._read, file)
+
+    def _parallel(self, files):
+        '''
+        Generate features of files, see help(type(self))
+        '''
+        files = iter(files)
+        prefetch = self.prefetch or 2 * self.workers
+
+        with ThreadPoolExecutor(self.io_threads) as readers, \
+                ProcessPoolExecutor(self.workers) as pool:
+            reads = deque(
+                self._submit_read(readers, file)
+                for file in islice(files, prefetch)
+            )
+            computes = deque()
+
+            while reads or computes:
+                # Decoded images are sent to the pool while there is room
+                while reads and len(computes) < prefetch:
+                    file, key, cached, read = reads.popleft()
+                    if cached is None:
+                        image = read.result()
+                        computes.append(
+                            (file, key, pool.submit(self.extractor, image)))
+                    else:
+                        done = Future()
+                        done.set_result(cached)
+                        computes.append((None, None, done))
+                    for file in islice(files, 1):
+                        reads.append(self._submit_read(readers, file))
+
+                file, key, compute = computes.popleft()
+                value = compute.result()
+                if file is not None:
+                    self._store(file, key, value)
+                yield value
+
     def __call__(self, folder):
+        if self.workers is not None:
+            return self._parallel(folder.iterdir())
+
         return (
             self._process(file)
             for file in folder.iterdir()
@@ -1,6 +1,4 @@
-import cv2
 import numpy as np
-from scipy import ndimage
 from numpy import fft
 
 
@@ -9,48 +7,78 @@ class HCFCOM:
     Center of mass (COM) of histogram characteristic function (HCF) of
     color images. HCF is a representation of the image histogram in
     the frequency domain
+
+    A batch of images with (n, h, w, 3) shape can be processed at once.
     '''
 
+    # FIXME: arbritarly 8 bit image (256 posibles values) is used
+    bins = 256
+    # Cached features of other versions are not used, see
+    # help(cache.extractor_id)
+    version = 1
+
     def histogram(self, image):
         '''
         color_histogram(image) => numpy array: return histogram of color image
         @image: np array representative of image
 
-        Calculate histogram of image per channel (R, G, B)
-        using opencv calHist function. Array returned has (3, N) shape where
-        N is bean of histogram
+        Calculate histogram of image per channel (R, G, B). Values of
+        each channel are offset by channel * bins so histograms of all
+        channels (and all images of a batch) are counted with one
+        np.bincount call. Array returned has (3, N) shape where N is
+        bean of histogram, (n, 3, N) for a batch of images.
+        Raise ValueError if image has not color channels.
         '''
-        # FIXME: arbritarly 8 bit image (256 posibles values) is used
-        red_histogram = cv2.calcHist(
-            [image], [0], None, [256], [0, 256]).reshape(-1)
-        green_histogram = cv2.calcHist(
-            [image], [1], None, [256], [0, 256]).reshape(-1)
-        blue_histogram = cv2.calcHist(
-            [image], [2], None, [256], [0, 256]).reshape(-1)
+        image = np.asarray(image)
+        if image.ndim < 3 or image.shape[-1] < 3:
+            raise ValueError('A color image (R, G, B channels) is required')
+        # Alpha channel is not used
+        image = image[..., :3]
+        channels = 3
+        batch = image.shape[:-3]
+        number = int(np.prod(batch))
+
+        size = number * channels * (self.bins + 1)
+        dtype = np.uint16 if size <= np.iinfo(np.uint16).max else np.intp
+
+        # Bin of a value is offset + value + 1, first bin of each
+        # channel counts values out of [0, bins) range
+        values = image.reshape(number, -1, channels)
+        if values.dtype == np.uint8:
+            indexes = values.astype(dtype)
+            indexes += 1
+        else:
+            indexes = np.where(
+                (values >= 0) & (values < self.bins), values + 1, 0
+            ).astype(dtype)
+        indexes += (
+            np.arange(number, dtype=dtype).reshape(-1, 1, 1) *
+            dtype(channels * (self.bins + 1))
+        )
+        for channel in range(channels):
+            indexes[..., channel] += dtype(channel * (self.bins + 1))
+
+        counts = np.bincount(
+            indexes.reshape(-1), minlength=size
+        ).reshape(number, channels, self.bins + 1)
 
-        normalize_histogram = np.array([
-            red_histogram,
-            green_histogram,
-            blue_histogram
-        ]) / image.size
+        normalize_histogram = counts[..., 1:] / (image.size // max(number, 1))
 
-        return normalize_histogram
+        return normalize_histogram.reshape(batch + (channels, self.bins))
 
     def __call__(self, image):
         '''
         center_mass(histogram) => numpy array: return color image`s center of
         mass. Array returned has (3,) shape with one component for each
-        imagen color channels.
+        imagen color channels, (n, 3) for a batch of images.
         '''
 
         # Characteristic function
-        hchf = fft.ifft(self.histogram(image))
+        hchf = fft.ifft(self.histogram(image), axis=-1)
         # Only [0, N/2 -1 ] coeficients of DFT are used
         # to calculate center of mass
         # FIXME: arbritarly 8 bit image (256 posibles values) is used
-        hchf_modified = np.absolute(hchf[:, :127])
+        hchf_modified = np.absolute(hchf[..., :127])
 
-        return np.array([
-            ndimage.center_of_mass(channel)[0]
-            for channel in hchf_modified
-        ])
+        indexes = np.arange(hchf_modified.shape[-1])
+        return hchf_modified @ indexes / hchf_modified.sum(axis=-1)
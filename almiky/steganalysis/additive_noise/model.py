@@ -1,5 +1,23 @@
+import warnings
+
 import numpy as np
-from scipy.spatial import distance
+from scipy import linalg
+
+
+def _inverse(matrix):
+    '''
+    Return inverse of a covariance matrix. Matrix X = I is solved by
+    Cholesky factorization instead of explicit inversion,
+    pseudo-inverse is returned for singular, ill-conditioned or not
+    positive definite matrices.
+    '''
+    with warnings.catch_warnings():
+        # Ill-conditioned matrices are warned
+        warnings.simplefilter('error', linalg.LinAlgWarning)
+        try:
+            return linalg.solve(matrix, np.eye(len(matrix)), assume_a='pos')
+        except (linalg.LinAlgError, linalg.LinAlgWarning):
+            return np.linalg.pinv(matrix, hermitian=True)
 
 
 class AdditiveNoiseEstimator:
@@ -14,27 +32,126 @@ class AdditiveNoiseEstimator:
         self.threshold = threshold
         self.mean = mean
         self.icovariance = icovariance
+        # Number of items and sum of squared deviations (co-moment
+        # matrix) of data fitted, used to update mean and covariance
+        self.count = 0
+        self.comoment = None
 
     def fit(self, data):
         '''
         estimador.fit(data) => None: Calculate mean an covariance
         of data. data parameter must be an numpy array
         '''
+        self.count = 0
+        self.partial_fit(data)
+
+    def partial_fit(self, batch):
+        '''
+        estimador.partial_fit(batch) => self: Update mean and covariance
+        with a batch of data (Chan et al. parallel update), so a data
+        stream can be fitted without loading it at once:
+
+        for batch in batches:
+            estimator.partial_fit(batch)
+        '''
+        batch = np.asarray(batch, dtype=np.float64)
+        batch = batch.reshape(-1, batch.shape[-1])
+        if not len(batch):
+            return self
+
+        mean = batch.mean(axis=0)
+        delta = batch - mean
+        other = AdditiveNoiseEstimator(self.threshold)
+        other.count = len(batch)
+        other.mean = mean
+        other.comoment = delta.T @ delta
+
+        return self.merge(other)
+
+    def merge(self, other):
+        '''
+        estimador.merge(other) => self: Update mean and covariance with
+        data fitted by other estimator, e.g. an estimator fitted by
+        a worker with a shard of data.
+        '''
+        if not other.count:
+            return self
+
+        if not self.count:
+            self.count = other.count
+            self.mean = np.array(other.mean, dtype=np.float64)
+            self.comoment = np.array(other.comoment, dtype=np.float64)
+        else:
+            count = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean = self.mean + delta * (other.count / count)
+            self.comoment = (
+                self.comoment + other.comoment +
+                np.outer(delta, delta) * (self.count * other.count / count)
+            )
+            self.count = count
+
+        if self.count > 1:
+            self.icovariance = _inverse(self.covariance)
+
+        return self
+
+    @property
+    def covariance(self):
+        '''
+        Covariance of data fitted (as np.cov, normalized by count - 1)
+        '''
+        return self.comoment / (self.count - 1)
 
-        self.mean = np.mean(data, axis=0)
-        self.icovariance = np.linalg.inv(np.cov(data.transpose()))
+    @property
+    def whitening(self):
+        '''
+        Whitening factor L of inverse covariance (icovariance = L L^T),
+        distance of x is the norm of (x - mean) L. None if icovariance
+        is not positive definite.
+        '''
+        try:
+            return np.linalg.cholesky(self.icovariance)
+        except np.linalg.LinAlgError:
+            return None
 
-    def predict(self, data):
+    def distance(self, data):
+        '''
+        estimador.distance(data) => numpy array: return mahalanobis
+        distance between each item of data and mean.
+
+        Data is whitened at once with a Cholesky factor of icovariance.
+        If icovariance is not positive definite quadratic forms are
+        computed with einsum (nan for negative values, as
+        scipy.spatial.distance.mahalanobis).
+        '''
+        delta = np.asarray(data, dtype=np.float64) - self.mean
+        factor = self.whitening
+        if factor is None:
+            squared = np.einsum(
+                'ij,jk,ik->i', delta, self.icovariance, delta)
+        else:
+            whitened = delta @ factor
+            squared = np.einsum('ij,ij->i', whitened, whitened)
+
+        with np.errstate(invalid='ignore'):
+            return np.sqrt(squared)
+
+    def predict(self, data, return_distance=False):
         '''
         estimador.predict(data) => numpy array: Classificate data using
-        a distance (defined in self._distance method) and threshold.
+        mahalanobis distance (see help(self.distance)) and threshold.
         Data must be an numpy array.
-        Return a numpy array where values are one if item belong to class
-        but cero otherwise.
-        '''
-        return [
-            1 if distance.mahalanobis(
-                item, self.mean, self.icovariance
-            ) < self.threshold else -1
-            for item in data
-        ]
+        Return a numpy array (np.int8) where values are one if item
+        belong to class but minus one otherwise.
+
+        estimador.predict(data, return_distance=True) => (numpy array,
+        numpy array): return predictions and distances.
+        '''
+        distances = self.distance(data)
+        predictions = np.where(
+            distances < self.threshold, 1, -1).astype(np.int8)
+
+        if return_distance:
+            return predictions, distances
+        return predictions
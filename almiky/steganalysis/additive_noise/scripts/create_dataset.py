@@ -2,8 +2,10 @@ import argparse
 import numpy as np
 from pathlib import Path
 
+from almiky.steganalysis.additive_noise import cache
 from almiky.steganalysis.additive_noise import metrics
 from almiky.steganalysis.additive_noise import features
+from almiky.steganalysis.additive_noise import storage
 
 
 def main():
@@ -16,7 +18,8 @@ def main():
         "-o",
         "--output",
         required=True,
-        help="File where dataset will be saved")
+        help="File where dataset will be saved (.npy binary dataset, "
+             "text otherwise)")
     parser.add_argument(
         "-t",
         "--target",
@@ -25,22 +28,54 @@ def main():
     parser.add_argument(
         "-s",
         "--size",
-        required=True,
-        help="Size of dataset")
+        help="Size of dataset (default is number of images)")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help="Number of processes extracting features "
+             "(default is sequential extraction)")
+    parser.add_argument(
+        "-c",
+        "--cache",
+        help="Feature cache database (default is no cache)")
+    parser.add_argument(
+        "--strict-cache",
+        action="store_true",
+        help="Identify cached images by content hash instead of "
+             "inode and modification time")
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        help="Max bytes of cached features (default is unbounded)")
 
     args = parser.parse_args()
 
-    size = int(args.size)
     target = int(args.target)
-    target = np.full((size, 1), target)
     indir = Path(args.indir)
+    if args.size is None:
+        size = sum(1 for _ in indir.iterdir())
+    else:
+        size = int(args.size)
 
     hchfcom = metrics.HCFCOM()
-    load = features.ProcessImageFolder(hchfcom)
+    features_cache = None
+    if args.cache is not None:
+        features_cache = cache.FeatureCache(
+            args.cache, strict=args.strict_cache, max_size=args.cache_size)
+    load = features.ProcessImageFolder(
+        hchfcom, workers=args.workers, cache=features_cache)
+
+    if args.output.endswith('.npy'):
+        # Rows are written as they are computed
+        storage.write_dataset(load(indir), args.output, size, target)
+    else:
+        data = list(load(indir))
+        dataset = np.append(data, np.full((len(data), 1), target), axis=1)
+        np.savetxt(args.output, dataset)
 
-    data = list(load(indir))
-    dataset = np.append(data, target, axis=1)
-    np.savetxt(args.output, dataset)
+    if features_cache is not None:
+        features_cache.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+import argparse
+import numpy as np
+
+from almiky.steganalysis.additive_noise import evaluation
+from almiky.steganalysis.additive_noise import storage
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Evaluate detector for every threshold (ROC curve)'
+    )
+    parser.add_argument(
+        "dataset", metavar="dataset",
+        help="Dataset with cover and stego images (target column)")
+    parser.add_argument(
+        "-m",
+        "--model",
+        required=True,
+        help="Model file (.npz binary model, text otherwise)")
+    parser.add_argument(
+        "-p",
+        "--positive",
+        type=int,
+        default=-1,
+        help="Target of stego images (default is -1)")
+    parser.add_argument(
+        "-c",
+        "--criterion",
+        default="youden",
+        choices=("youden", "accuracy", "f1"),
+        help="Criterion of best threshold (default is youden)")
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="File where ROC curve (fpr, tpr, threshold) will be saved")
+    parser.add_argument(
+        "-b",
+        "--bootstrap",
+        type=int,
+        default=0,
+        help="Number of bootstrap resamples of AUC confidence interval "
+             "(default is no interval)")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help="Number of bootstrap processes")
+
+    args = parser.parse_args()
+
+    # Distances are computed once, by chunks
+    dataset = storage.load_dataset(args.dataset)
+    estimator = storage.load_model(args.model)
+    scores = np.concatenate([np.zeros(0)] + [
+        estimator.distance(data) for data in storage.chunks(dataset)])
+    positives = np.asarray(dataset[storage.TARGET]) == args.positive
+
+    fpr, tpr, thresholds = evaluation.roc_curve(scores, positives)
+    threshold, value = evaluation.best_threshold(
+        scores, positives, args.criterion)
+
+    print('AUC: {}'.format(evaluation.auc(fpr, tpr)))
+    print('Average precision: {}'.format(
+        evaluation.average_precision(scores, positives)))
+    print('Best threshold ({}): {} ({})'.format(
+        args.criterion, threshold, value))
+
+    if args.bootstrap:
+        interval = evaluation.bootstrap(
+            scores, positives, samples=args.bootstrap, workers=args.workers)
+        print('AUC 95% confidence interval: [{}, {}]'.format(
+            interval.low, interval.high))
+
+    if args.output is not None:
+        np.savetxt(args.output, np.column_stack((fpr, tpr, thresholds)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import argparse
 import numpy as np
 
-from almiky.steganalysis.additive_noise import model
+from almiky.steganalysis.additive_noise import storage
 
 
 def main():
@@ -13,32 +13,39 @@ def main():
         "-m",
         "--model",
         required=True,
-        help="File where dataset will be saved")
+        help="Model file (.npz binary model, text otherwise)")
     parser.add_argument(
         "-t",
         "--target",
         required=True,
-        help="File where target will be saved")
+        help="File where target will be saved (.npy binary, "
+             "text otherwise)")
     parser.add_argument(
         "-r",
         "--threshold",
         required=True,
-        help="File where target will be saved")
+        help="Distance threshold")
 
     args = parser.parse_args()
 
     threshold = float(args.threshold)
-    data = np.loadtxt(args.dataset, usecols=(0, 1, 2))
-    model_data = np.loadtxt(args.model)
-    mean = model_data[:3]
-    icovariance = model_data[3:].reshape(3, 3)
-
-    estimator = model.AdditiveNoiseEstimator()
-    estimator.mean = mean
-    estimator.icovariance = icovariance
-    predictions = estimator.predict(data, threshold)
-
-    np.savetxt(args.target, predictions)
+    dataset = storage.load_dataset(args.dataset)
+    estimator = storage.load_model(args.model)
+    estimator.threshold = threshold
+
+    # Memory mapped datasets are scored by chunks
+    if args.target.endswith('.npy'):
+        predictions = np.lib.format.open_memmap(
+            args.target, mode='w+', dtype=np.int8, shape=(len(dataset),))
+        start = 0
+        for data in storage.chunks(dataset):
+            predictions[start:start + len(data)] = estimator.predict(data)
+            start += len(data)
+        predictions.flush()
+    else:
+        predictions = np.concatenate([np.zeros(0, dtype=np.int8)] + [
+            estimator.predict(data) for data in storage.chunks(dataset)])
+        np.savetxt(args.target, predictions)
 
 
 if __name__ == "__main__":
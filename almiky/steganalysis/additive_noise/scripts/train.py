@@ -2,6 +2,7 @@ import argparse
 import numpy as np
 
 from almiky.steganalysis.additive_noise import model
+from almiky.steganalysis.additive_noise import storage
 
 
 def main():
@@ -13,17 +14,23 @@ def main():
         "-o",
         "--output",
         required=True,
-        help="File where dataset will be saved")
+        help="File where model will be saved (.npz binary model, "
+             "text otherwise)")
 
     args = parser.parse_args()
 
-    data = np.loadtxt(args.dataset, usecols=(0, 1, 2))
+    # Memory mapped datasets are fitted by chunks
+    dataset = storage.load_dataset(args.dataset)
     estimator = model.AdditiveNoiseEstimator()
-    estimator.fit(data)
-
-    icovariance = estimator.icovariance.reshape(-1)
-    data = np.concatenate((estimator.mean, icovariance)).reshape(1, -1)
-    np.savetxt(args.output, data)
+    for data in storage.chunks(dataset):
+        estimator.partial_fit(data)
+
+    if args.output.endswith('.npz'):
+        storage.save_model(args.output, estimator)
+    else:
+        icovariance = estimator.icovariance.reshape(-1)
+        data = np.concatenate((estimator.mean, icovariance)).reshape(1, -1)
+        np.savetxt(args.output, data)
 
 
 if __name__ == "__main__":
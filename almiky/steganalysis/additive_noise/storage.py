@@ -0,0 +1,195 @@
+'''
+Binary formats of datasets and models.
+
+A dataset is a .npy file of a structured array: field names are
+feature names (and 'target' column), so the .npy header describes
+feature names, dtype and target column. Datasets can be memory mapped
+and processed in chunks:
+
+dataset = storage.load_dataset('cover.npy')
+for data in storage.chunks(dataset):
+    ...
+
+A model is a .npz file holding mean, whitening factor of inverse
+covariance and, when they are known, count and co-moment of data
+fitted.
+
+Text files (np.savetxt) are still read and written.
+'''
+
+import os
+
+import numpy as np
+from numpy.lib import recfunctions
+
+from almiky.steganalysis.additive_noise import model
+
+# Names of HCFCOM features (center of mass of each channel)
+FEATURES = ('red', 'green', 'blue')
+TARGET = 'target'
+
+# Rows processed at once
+CHUNK_ROWS = 1 << 16
+
+
+def dataset_dtype(names=FEATURES, dtype=np.float64, target=True):
+    '''
+    dataset_dtype(names, dtype, target) => np.dtype: return structured
+    dtype of a dataset with (names) features and (target) column
+    (np.int8 values) if target is True.
+    '''
+    fields = [(name, dtype) for name in names]
+    if target:
+        fields.append((TARGET, np.int8))
+
+    return np.dtype(fields)
+
+
+def feature_names(dataset):
+    '''
+    feature_names(dataset) => tuple: return feature names of a dataset
+    '''
+    return tuple(name for name in dataset.dtype.names if name != TARGET)
+
+
+def write_dataset(features, path, size, target=None, names=FEATURES,
+                  dtype=np.float64):
+    '''
+    write_dataset(features, path, size, target) => int: write features
+    incrementally in a .npy dataset (one row for each item, target
+    column if it is given) and return number of rows written.
+    Rows are written to a memory map, whole dataset is never kept
+    in memory.
+
+    Raise ValueError if there are more items than size. If there are
+    less, unused rows are removed.
+
+    Arguments:
+    features -- iterable of features (1-D arrays with the same length)
+    path -- .npy file path
+    size -- max number of rows
+    target -- target value (default is None: no target column)
+    names -- feature names (default is FEATURES)
+    dtype -- features dtype (default is np.float64)
+    '''
+    structure = dataset_dtype(names, dtype, target is not None)
+    dataset = np.lib.format.open_memmap(
+        str(path), mode='w+', dtype=structure, shape=(size,))
+
+    # Target column is written with each record
+    tail = () if target is None else (target,)
+    rows = 0
+    for value in features:
+        if rows == size:
+            raise ValueError('There are more items than dataset size')
+        value = np.asarray(value).reshape(-1)
+        dataset[rows] = tuple(value[:len(names)]) + tail
+        rows += 1
+
+    if rows < size:
+        # Remove unused rows
+        trimmed_path = '{}.tmp'.format(path)
+        trimmed = np.lib.format.open_memmap(
+            trimmed_path, mode='w+', dtype=structure, shape=(rows,))
+        for start in range(0, rows, CHUNK_ROWS):
+            stop = min(start + CHUNK_ROWS, rows)
+            trimmed[start:stop] = dataset[start:stop]
+        trimmed.flush()
+        del trimmed
+        del dataset
+        os.replace(trimmed_path, str(path))
+    else:
+        dataset.flush()
+        del dataset
+
+    return rows
+
+
+def load_dataset(path, mmap=True):
+    '''
+    load_dataset(path) => np.ndarray: return a dataset (structured
+    array), memory mapped by default. Text datasets (np.savetxt,
+    feature columns followed by target column) are loaded in memory.
+    '''
+    path = str(path)
+    if path.endswith('.npy'):
+        return np.load(path, mmap_mode='r' if mmap else None)
+
+    data = np.loadtxt(path, ndmin=2)
+    has_target = data.shape[1] > len(FEATURES)
+    structure = dataset_dtype(FEATURES, data.dtype, has_target)
+    return recfunctions.unstructured_to_structured(
+        data[:, :len(structure)], structure)
+
+
+def features(dataset, names=None):
+    '''
+    features(dataset) => np.ndarray: return features of a dataset (or
+    a chunk) as a (n, features) float array.
+    '''
+    names = list(names or feature_names(dataset))
+    return recfunctions.structured_to_unstructured(
+        dataset[names], dtype=np.float64)
+
+
+def chunks(dataset, size=CHUNK_ROWS, names=None):
+    '''
+    chunks(dataset, size) => generator: generate features of dataset
+    as (size, features) float arrays, only a chunk is kept in memory.
+    '''
+    for start in range(0, len(dataset), size):
+        yield features(dataset[start:start + size], names)
+
+
+def save_model(path, estimator):
+    '''
+    save_model(path, estimator) => None: save an estimator in a .npz
+    file. Whitening factor L of inverse covariance (L L^T) is saved,
+    inverse covariance itself only if it is not positive definite.
+    '''
+    values = {
+        'threshold': estimator.threshold,
+        'mean': estimator.mean,
+    }
+    factor = estimator.whitening
+    if factor is None:
+        values['icovariance'] = estimator.icovariance
+    else:
+        values['factor'] = factor
+    if estimator.count:
+        values['count'] = estimator.count
+        values['comoment'] = estimator.comoment
+
+    np.savez(str(path), **values)
+
+
+def load_model(path):
+    '''
+    load_model(path) => AdditiveNoiseEstimator: load an estimator saved
+    with save_model (.npz file) or as text (mean followed by flattened
+    inverse covariance).
+    '''
+    path = str(path)
+    if not path.endswith('.npz'):
+        data = np.loadtxt(path)
+        features = len(FEATURES)
+        return model.AdditiveNoiseEstimator(
+            mean=data[:features],
+            icovariance=data[features:].reshape(features, features)
+        )
+
+    with np.load(path) as values:
+        estimator = model.AdditiveNoiseEstimator(
+            threshold=values['threshold'].item(),
+            mean=values['mean'],
+        )
+        if 'factor' in values:
+            factor = values['factor']
+            estimator.icovariance = factor @ factor.T
+        else:
+            estimator.icovariance = values['icovariance']
+        if 'count' in values:
+            estimator.count = values['count'].item()
+            estimator.comoment = values['comoment']
+
+    return estimator
@@ -0,0 +1,152 @@
+import os
+from pathlib import Path
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import imageio
+import numpy as np
+
+from almiky.steganalysis.additive_noise import cache
+from almiky.steganalysis.additive_noise import features
+from almiky.steganalysis.additive_noise import metrics
+
+
+class Extractor:
+    version = 1
+
+    def __call__(self, image):
+        return np.asarray(image).mean(axis=(0, 1))
+
+
+class FeatureCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.base = Path(self.folder.name)
+        self.database = self.base.joinpath('features.sqlite')
+        self.file = self.base.joinpath('image.bin')
+        self.file.write_bytes(b'image')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_get_set(self):
+        extractor = Extractor()
+        value = np.random.rand(3)
+
+        with cache.FeatureCache(self.database) as features_cache:
+            self.assertIsNone(features_cache.get(self.file, extractor))
+            features_cache.set(self.file, extractor, value)
+
+        with cache.FeatureCache(self.database) as features_cache:
+            np.testing.assert_array_equal(
+                features_cache.get(self.file, extractor), value)
+
+    def test_extractor_version(self):
+        extractor = Extractor()
+        features_cache = cache.FeatureCache(self.database)
+        features_cache.set(self.file, extractor, np.random.rand(3))
+
+        extractor.version = 2
+        self.assertIsNone(features_cache.get(self.file, extractor))
+        self.assertIsNone(features_cache.get(self.file, metrics.HCFCOM()))
+        features_cache.close()
+
+    def test_modified_file(self):
+        extractor = Extractor()
+        features_cache = cache.FeatureCache(self.database)
+        features_cache.set(self.file, extractor, np.random.rand(3))
+
+        stat = os.stat(str(self.file))
+        os.utime(str(self.file), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertIsNone(features_cache.get(self.file, extractor))
+        features_cache.close()
+
+    def test_strict(self):
+        extractor = Extractor()
+        value = np.random.rand(3)
+        copy = self.base.joinpath('copy.bin')
+        copy.write_bytes(b'image')
+        features_cache = cache.FeatureCache(self.database, strict=True)
+        features_cache.set(self.file, extractor, value)
+
+        # Same content
+        np.testing.assert_array_equal(
+            features_cache.get(copy, extractor), value)
+        copy.write_bytes(b'other')
+        self.assertIsNone(features_cache.get(copy, extractor))
+        features_cache.close()
+
+    def test_eviction(self):
+        extractor = Extractor()
+        files = []
+        for i in range(4):
+            files.append(self.base.joinpath('{}.bin'.format(i)))
+            files[-1].write_bytes(bytes([i]))
+
+        # Room for two items of 24 bytes
+        features_cache = cache.FeatureCache(self.database, max_size=48)
+        features_cache.set(files[0], extractor, np.zeros(3))
+        features_cache.set(files[1], extractor, np.ones(3))
+        # Recently used
+        features_cache.get(files[0], extractor)
+        features_cache.set(files[2], extractor, np.ones(3))
+
+        self.assertEqual(features_cache.size, 48)
+        self.assertIsNotNone(features_cache.get(files[0], extractor))
+        self.assertIsNone(features_cache.get(files[1], extractor))
+        self.assertIsNotNone(features_cache.get(files[2], extractor))
+        features_cache.close()
+
+
+class CachedFolderLoadTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        base = Path(self.folder.name)
+        self.images = base.joinpath('images')
+        self.images.mkdir()
+        self.database = base.joinpath('features.sqlite')
+        for i in range(4):
+            image = np.random.randint(0, 256, (8, 8, 3), np.uint8)
+            imageio.imwrite(
+                str(self.images.joinpath('{}.png'.format(i))), image)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def check_cache(self, workers):
+        extractor = Extractor()
+        with cache.FeatureCache(self.database) as features_cache:
+            load = features.ProcessImageFolder(
+                extractor, workers=workers, cache=features_cache)
+            expected = list(load(self.images))
+
+        # Images are not decoded again
+        with cache.FeatureCache(self.database) as features_cache, \
+                patch.object(features.imageio, 'imread', Mock()) as imread:
+            load = features.ProcessImageFolder(
+                extractor, workers=workers, cache=features_cache)
+            np.testing.assert_array_equal(list(load(self.images)), expected)
+            imread.assert_not_called()
+
+    def test_sequential(self):
+        self.check_cache(None)
+
+    def check_hashed_once(self, workers):
+        with cache.FeatureCache(self.database, strict=True) as features_cache:
+            key = Mock(wraps=features_cache.key)
+            features_cache.key = key
+            load = features.ProcessImageFolder(
+                Extractor(), workers=workers, cache=features_cache)
+            list(load(self.images))
+
+        # Files are hashed once when features are not cached
+        self.assertEqual(key.call_count, 4)
+
+    def test_hashed_once(self):
+        self.check_hashed_once(None)
+        self.database.unlink()
+        self.check_hashed_once(2)
+
+    def test_parallel(self):
+        self.check_cache(2)
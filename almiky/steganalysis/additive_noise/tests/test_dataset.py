@@ -1,11 +1,13 @@
 from pathlib import Path
+import tempfile
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import numpy as np
 import imageio
 
 from almiky.steganalysis.additive_noise import features
+from almiky.steganalysis.additive_noise import metrics
 
 
 class DirectoryLoadTest(unittest.TestCase):
@@ -26,7 +28,23 @@ class DirectoryLoadTest(unittest.TestCase):
         folder.iterdir.return_value = files
         metric = Mock(side_effect=list(coms))
         process = features.ProcessImageFolder(metric)
-        imageio.imread = Mock(side_effect=list(images))
 
-        ft = process(folder)
-        np.testing.assert_array_equal(list(ft), list(coms))
+        with patch.object(
+                features.imageio, 'imread', Mock(side_effect=list(images))):
+            ft = process(folder)
+            np.testing.assert_array_equal(list(ft), list(coms))
+
+    def test_parallel_folder_loading(self):
+        with tempfile.TemporaryDirectory() as folder:
+            folder = Path(folder)
+            images = np.random.randint(0, 256, (5, 16, 16, 3), np.uint8)
+            for i, image in enumerate(images):
+                imageio.imwrite(str(folder.joinpath('{}.png'.format(i))), image)
+
+            hcfcom = metrics.HCFCOM()
+            sequential = features.ProcessImageFolder(hcfcom)
+            parallel = features.ProcessImageFolder(
+                hcfcom, workers=2, io_threads=2, prefetch=2)
+
+            np.testing.assert_array_equal(
+                list(parallel(folder)), list(sequential(folder)))
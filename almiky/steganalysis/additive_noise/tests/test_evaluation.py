@@ -0,0 +1,125 @@
+import unittest
+
+import numpy as np
+
+from almiky.steganalysis.additive_noise import evaluation
+
+
+def brute_force(scores, positives, threshold):
+    '''
+    Return (tp, fp) classifying items with score >= threshold
+    as positives
+    '''
+    predicted = scores >= threshold
+    return (
+        np.sum(predicted & positives),
+        np.sum(predicted & ~positives)
+    )
+
+
+class SweepTest(unittest.TestCase):
+    def setUp(self):
+        # Ties are included
+        self.scores = np.round(np.random.rand(200) * 50)
+        self.positives = np.random.rand(200) < 0.4
+        self.scores[self.positives] += 10
+
+    def test_sweep(self):
+        thresholds, tp, fp = evaluation.sweep(self.scores, self.positives)
+
+        np.testing.assert_array_equal(
+            thresholds, np.unique(self.scores)[::-1])
+        for threshold, true, false in zip(thresholds, tp, fp):
+            self.assertEqual(
+                (true, false),
+                brute_force(self.scores, self.positives, threshold))
+
+    def test_roc_curve(self):
+        fpr, tpr, thresholds = evaluation.roc_curve(
+            self.scores, self.positives)
+
+        self.assertEqual((fpr[0], tpr[0], thresholds[0]), (0, 0, np.inf))
+        self.assertEqual((fpr[-1], tpr[-1]), (1, 1))
+        for false_rate, true_rate, threshold in zip(
+                fpr[1:], tpr[1:], thresholds[1:]):
+            tp, fp = brute_force(self.scores, self.positives, threshold)
+            self.assertAlmostEqual(true_rate, tp / self.positives.sum())
+            self.assertAlmostEqual(false_rate, fp / (~self.positives).sum())
+
+    def test_roc_auc(self):
+        positive = self.scores[self.positives]
+        negative = self.scores[~self.positives]
+        # Mann-Whitney statistic
+        expected = (
+            np.sum(positive[:, None] > negative) +
+            np.sum(positive[:, None] == negative) / 2
+        ) / (positive.size * negative.size)
+
+        self.assertAlmostEqual(
+            evaluation.roc_auc(self.scores, self.positives), expected)
+
+    def test_precision_recall_curve(self):
+        precision, recall, thresholds = evaluation.precision_recall_curve(
+            self.scores, self.positives)
+
+        self.assertTrue(np.all(np.diff(recall) >= 0))
+        for value, rate, threshold in zip(precision, recall, thresholds):
+            tp, fp = brute_force(self.scores, self.positives, threshold)
+            self.assertAlmostEqual(value, tp / (tp + fp))
+            self.assertAlmostEqual(rate, tp / self.positives.sum())
+
+    def test_best_threshold(self):
+        total = self.positives.sum()
+        for criterion, function in (
+                ('youden', lambda tp, fp: tp / total - fp / (200 - total)),
+                ('accuracy', lambda tp, fp: (tp + 200 - total - fp) / 200),
+                ('f1', lambda tp, fp: 2 * tp / (tp + fp + total))):
+            threshold, value = evaluation.best_threshold(
+                self.scores, self.positives, criterion)
+            expected = max(
+                function(*brute_force(self.scores, self.positives, t))
+                for t in np.unique(self.scores)
+            )
+            self.assertAlmostEqual(value, expected)
+            self.assertAlmostEqual(
+                function(*brute_force(
+                    self.scores, self.positives, threshold)),
+                expected)
+
+    def test_perfect_detector(self):
+        scores = np.array([1, 2, 3, 10, 11])
+        positives = np.array([0, 0, 0, 1, 1])
+
+        self.assertEqual(evaluation.roc_auc(scores, positives), 1)
+        self.assertEqual(
+            evaluation.average_precision(scores, positives), 1)
+        self.assertEqual(
+            evaluation.best_threshold(scores, positives), (10, 1))
+
+    def test_one_class(self):
+        with self.assertRaises(ValueError):
+            evaluation.roc_curve(np.random.rand(5), np.zeros(5))
+
+    def test_unknown_criterion(self):
+        with self.assertRaises(ValueError):
+            evaluation.best_threshold(
+                np.random.rand(4), np.array([0, 1, 0, 1]), 'unknown')
+
+
+class BootstrapTest(unittest.TestCase):
+    def test_bootstrap(self):
+        scores = np.random.rand(100)
+        positives = np.random.rand(100) < 0.5
+        scores[positives] += 0.3
+
+        interval = evaluation.bootstrap(
+            scores, positives, samples=250, seed=7)
+        self.assertEqual(
+            interval.estimate, evaluation.roc_auc(scores, positives))
+        self.assertLessEqual(interval.low, interval.estimate)
+        self.assertGreaterEqual(interval.high, interval.estimate)
+
+        # Same resamples for any number of workers
+        parallel = evaluation.bootstrap(
+            scores, positives, samples=250, seed=7, workers=2)
+        self.assertEqual(interval, parallel)
@@ -3,7 +3,6 @@ from pathlib import Path
 import unittest
 from unittest.mock import Mock
 
-import cv2
 import numpy as np
 from scipy import ndimage
 
@@ -12,31 +11,14 @@ from almiky.steganalysis.additive_noise import metrics
 IMAGE_DIR = Path(__file__).parent.joinpath('images')
 
 
-@unittest.expectedFailure
 class ColorImageHistogramTest(unittest.TestCase):
 
     def test_histogram_value(self):
-        red_histogram = np.random.rand(1, 256)
-        green_histogram = np.random.rand(1, 256)
-        blue_histogram = np.random.rand(1, 256)
-        histogram = np.array([
-            red_histogram.reshape(-1),
-            green_histogram.reshape(-1),
-            blue_histogram.reshape(-1)]
-        )
-
-        def side_effect(img, channel, x, dean, range):
-            if channel == [0]:
-                value = red_histogram
-            elif channel == [1]:
-                value = green_histogram
-            elif channel == [2]:
-                value = blue_histogram
-            return value
-
-        cv2.calcHist = Mock(side_effect=side_effect)
         image = imageio.imread('{}/01.bmp'.format(IMAGE_DIR))
-        histogram /= image.size
+        histogram = np.array([
+            np.histogram(image[:, :, channel], bins=256, range=(0, 256))[0]
+            for channel in range(3)
+        ]) / image.size
 
         hcfcom = metrics.HCFCOM()
         hist = hcfcom.histogram(image)
@@ -48,6 +30,42 @@ class ColorImageHistogramTest(unittest.TestCase):
         hist = hcfcom.histogram(image)
         np.testing.assert_array_equal(hist.shape, (3, 256))
 
+    def test_values_out_of_range(self):
+        image = np.full((4, 4, 3), 10.5)
+        image[0, 0] = (-1, 256, 255.5)
+
+        hcfcom = metrics.HCFCOM()
+        hist = hcfcom.histogram(image) * image.size
+
+        np.testing.assert_array_equal(hist[:, 10], [15, 15, 15])
+        np.testing.assert_array_equal(hist[:, 255], [0, 0, 1])
+        np.testing.assert_array_equal(hist.sum(axis=1), [15, 15, 16])
+
+    def test_alpha_channel(self):
+        image = np.random.randint(0, 256, (16, 16, 4), np.uint8)
+        hcfcom = metrics.HCFCOM()
+
+        np.testing.assert_array_equal(
+            hcfcom.histogram(image), hcfcom.histogram(image[..., :3]))
+        np.testing.assert_array_equal(hcfcom(image).shape, (3,))
+
+    def test_grayscale_image(self):
+        hcfcom = metrics.HCFCOM()
+
+        with self.assertRaises(ValueError):
+            hcfcom.histogram(np.zeros((16, 16), np.uint8))
+        with self.assertRaises(ValueError):
+            hcfcom(np.zeros((16, 16, 1), np.uint8))
+
+    def test_batch(self):
+        images = np.random.randint(0, 256, (4, 16, 16, 3), np.uint8)
+        hcfcom = metrics.HCFCOM()
+
+        hist = hcfcom.histogram(images)
+        np.testing.assert_array_equal(hist.shape, (4, 3, 256))
+        for image, expected in zip(images, hist):
+            np.testing.assert_array_equal(hcfcom.histogram(image), expected)
+
 
 class CenterOfMassTest(unittest.TestCase):
     def test_center_mass(self):
@@ -62,4 +80,13 @@ class CenterOfMassTest(unittest.TestCase):
         ])
 
         com = hcfcom(image)
-        np.testing.assert_array_equal(com, expected_com)
+        np.testing.assert_array_almost_equal(com, expected_com)
+
+    def test_batch(self):
+        images = np.random.randint(0, 256, (4, 16, 16, 3), np.uint8)
+        hcfcom = metrics.HCFCOM()
+
+        com = hcfcom(images)
+        np.testing.assert_array_equal(com.shape, (4, 3))
+        for image, expected in zip(images, com):
+            np.testing.assert_array_almost_equal(hcfcom(image), expected)
@@ -3,7 +3,6 @@ Test for predictions
 '''
 
 import unittest
-from unittest.mock import Mock
 import numpy as np
 
 from scipy.spatial import distance
@@ -23,11 +22,98 @@ class ModelTest(unittest.TestCase):
         np.testing.assert_array_almost_equal(mean, estimator.mean)
         np.testing.assert_array_almost_equal(icov, estimator.icovariance)
 
+    def test_partial_fit(self):
+        data = np.random.rand(100, 3) * 50 + 100
+        estimator = AdditiveNoiseEstimator()
+
+        for batch in np.array_split(data, 7):
+            estimator.partial_fit(batch)
+
+        self.assertEqual(estimator.count, 100)
+        np.testing.assert_array_almost_equal(
+            estimator.mean, np.mean(data, axis=0))
+        np.testing.assert_array_almost_equal(
+            estimator.covariance, np.cov(data.transpose()))
+        np.testing.assert_array_almost_equal(
+            estimator.icovariance, np.linalg.inv(np.cov(data.transpose())))
+
+    def test_merge(self):
+        data = np.random.rand(50, 3)
+        shard1 = AdditiveNoiseEstimator().partial_fit(data[:20])
+        shard2 = AdditiveNoiseEstimator().partial_fit(data[20:])
+        estimator = AdditiveNoiseEstimator()
+        estimator.fit(data)
+
+        shard1.merge(shard2).merge(AdditiveNoiseEstimator())
+        self.assertEqual(shard1.count, 50)
+        np.testing.assert_array_almost_equal(shard1.mean, estimator.mean)
+        np.testing.assert_array_almost_equal(
+            shard1.icovariance, estimator.icovariance)
+
+    def test_singular_covariance(self):
+        data = np.random.rand(10, 2)
+        data = np.column_stack((data, data.sum(axis=1)))
+        estimator = AdditiveNoiseEstimator()
+        estimator.fit(data)
+
+        np.testing.assert_array_almost_equal(
+            estimator.icovariance, np.linalg.pinv(np.cov(data.transpose())))
+
     def test_predict(self):
-        data = np.random.rand(5, 3)
+        data = np.array([
+            [12, 0, 0], [40, 0, 0], [0, 30, 0], [0, 0, 86], [6, 8, 0]])
         estimator = AdditiveNoiseEstimator()
-        estimator.mean = np.random.rand(3)
-        estimator.icovariance = np.random.rand(3, 3)
-        distance.mahalanobis = Mock(side_effect=[12, 40, 30, 86, 10])
+        estimator.mean = np.zeros(3)
+        estimator.icovariance = np.eye(3)
         predictions = estimator.predict(data)
-        self.assertEqual(predictions, [1, -1, 1, -1, 1])
+
+        self.assertEqual(predictions.dtype, np.int8)
+        np.testing.assert_array_equal(predictions, [1, -1, 1, -1, 1])
+
+    def test_distance(self):
+        data = np.random.rand(20, 3)
+        factor = np.random.rand(3, 3)
+        estimator = AdditiveNoiseEstimator(threshold=0.5)
+        estimator.mean = np.random.rand(3)
+        estimator.icovariance = factor @ factor.T + np.eye(3)
+
+        predictions, distances = estimator.predict(
+            data, return_distance=True)
+        expected = np.array([
+            distance.mahalanobis(item, estimator.mean, estimator.icovariance)
+            for item in data
+        ])
+
+        np.testing.assert_array_almost_equal(distances, expected)
+        np.testing.assert_array_equal(
+            predictions, np.where(expected < 0.5, 1, -1))
+
+    def test_whitening(self):
+        factor = np.random.rand(3, 3)
+        estimator = AdditiveNoiseEstimator()
+        estimator.icovariance = factor @ factor.T + np.eye(3)
+
+        whitening = estimator.whitening
+
+        np.testing.assert_array_almost_equal(
+            whitening @ whitening.T, estimator.icovariance)
+
+        estimator.icovariance = np.diag([1.0, 2.0, -1.0])
+        self.assertIsNone(estimator.whitening)
+
+    def test_distance_not_positive_definite(self):
+        data = np.random.rand(20, 3)
+        estimator = AdditiveNoiseEstimator()
+        estimator.mean = np.random.rand(3)
+        estimator.icovariance = np.diag([1.0, 2.0, -1.0])
+
+        expected = np.array([
+            np.sqrt(np.dot(np.dot(item - estimator.mean,
+                                  estimator.icovariance),
+                           item - estimator.mean))
+            for item in data
+        ])
+
+        with np.errstate(invalid='ignore'):
+            np.testing.assert_array_almost_equal(
+                estimator.distance(data), expected)
@@ -0,0 +1,110 @@
+from pathlib import Path
+import tempfile
+import unittest
+
+import numpy as np
+
+from almiky.steganalysis.additive_noise import storage
+from almiky.steganalysis.additive_noise.model import AdditiveNoiseEstimator
+
+
+class DatasetTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name).joinpath('dataset.npy')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_write_dataset(self):
+        data = np.random.rand(4, 3)
+        rows = storage.write_dataset(iter(data), self.path, 4, target=1)
+        dataset = storage.load_dataset(self.path)
+
+        self.assertEqual(rows, 4)
+        self.assertIsInstance(dataset, np.memmap)
+        self.assertEqual(
+            dataset.dtype.names, ('red', 'green', 'blue', 'target'))
+        self.assertEqual(storage.feature_names(dataset), storage.FEATURES)
+        np.testing.assert_array_equal(storage.features(dataset), data)
+        np.testing.assert_array_equal(dataset['target'], np.ones(4))
+
+    def test_unused_rows(self):
+        data = np.random.rand(2, 3)
+        rows = storage.write_dataset(iter(data), self.path, 5)
+        dataset = storage.load_dataset(self.path)
+
+        self.assertEqual(rows, 2)
+        self.assertEqual(dataset.dtype.names, storage.FEATURES)
+        np.testing.assert_array_equal(storage.features(dataset), data)
+
+    def test_exceeded_size(self):
+        with self.assertRaises(ValueError):
+            storage.write_dataset(np.random.rand(3, 3), self.path, 2)
+
+    def test_chunks(self):
+        data = np.random.rand(10, 3)
+        storage.write_dataset(data, self.path, 10, target=-1)
+        dataset = storage.load_dataset(self.path)
+
+        chunks = list(storage.chunks(dataset, size=4))
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 2])
+        np.testing.assert_array_equal(np.concatenate(chunks), data)
+
+    def test_text_dataset(self):
+        data = np.column_stack((np.random.rand(5, 3), np.ones(5)))
+        path = Path(self.folder.name).joinpath('dataset.txt')
+        np.savetxt(str(path), data)
+        dataset = storage.load_dataset(path)
+
+        np.testing.assert_array_almost_equal(
+            storage.features(dataset), data[:, :3])
+        np.testing.assert_array_equal(dataset['target'], np.ones(5))
+
+
+class ModelTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name).joinpath('model.npz')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_save_model(self):
+        data = np.random.rand(20, 3)
+        estimator = AdditiveNoiseEstimator(threshold=2.5)
+        estimator.fit(data)
+
+        storage.save_model(self.path, estimator)
+        loaded = storage.load_model(self.path)
+
+        self.assertEqual(loaded.threshold, 2.5)
+        self.assertEqual(loaded.count, 20)
+        np.testing.assert_array_almost_equal(loaded.mean, estimator.mean)
+        np.testing.assert_array_almost_equal(
+            loaded.icovariance, estimator.icovariance)
+        np.testing.assert_array_almost_equal(
+            loaded.covariance, estimator.covariance)
+        np.testing.assert_array_equal(
+            loaded.predict(data), estimator.predict(data))
+
+    def test_not_positive_definite(self):
+        estimator = AdditiveNoiseEstimator(
+            mean=np.zeros(3), icovariance=np.diag([1.0, 2.0, -1.0]))
+
+        storage.save_model(self.path, estimator)
+        loaded = storage.load_model(self.path)
+
+        self.assertEqual(loaded.count, 0)
+        np.testing.assert_array_equal(
+            loaded.icovariance, estimator.icovariance)
+
+    def test_text_model(self):
+        path = Path(self.folder.name).joinpath('model.txt')
+        values = np.random.rand(12)
+        np.savetxt(str(path), values.reshape(1, -1))
+        loaded = storage.load_model(path)
+
+        np.testing.assert_array_almost_equal(loaded.mean, values[:3])
+        np.testing.assert_array_almost_equal(
+            loaded.icovariance, values[3:].reshape(3, 3))
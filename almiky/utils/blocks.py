@@ -1,3 +1,4 @@
+import numpy as np
 
 
 class BlocksImage():
@@ -21,6 +22,14 @@ class BlocksImage():
     It is posible too iterate over the blocks:
     for block in blocks: block[2][7] = ...
 
+    All blocks can be processed at once using a 4-D view
+    with shape (blocks_in_rows, blocks_in_cols, rows, cols):
+    grid = blocks.as_array()
+
+    or getting/setting several blocks by index:
+    stack = blocks.get_many([0, 5, 9])
+    blocks.set_many([0, 5, 9], stack)
+
     '''
     def __init__(self, image_plane, sblock_rows=8, sblock_cols=8):
         self.matrix = image_plane
@@ -51,6 +60,66 @@ class BlocksImage():
 
         raise IndexError("There is no such block")
 
+    def as_array(self):
+        '''
+        Return a writable view of the blocks with shape
+        (blocks_in_rows, blocks_in_cols, sblock_rows, sblock_cols).
+        No data is copied; modifications on the view modify the image.
+        Rows or columns out of complete blocks are excluded.
+        '''
+        rows = self.blocks_in_rows * self.size_block_rows
+        cols = self.blocks_in_cols * self.size_block_cols
+        plane = self.matrix[:rows, :cols]
+        row_stride, col_stride = plane.strides[:2]
+
+        return np.lib.stride_tricks.as_strided(
+            plane,
+            shape=(
+                self.blocks_in_rows, self.blocks_in_cols,
+                self.size_block_rows, self.size_block_cols
+            ) + plane.shape[2:],
+            strides=(
+                row_stride * self.size_block_rows,
+                col_stride * self.size_block_cols,
+            ) + plane.strides
+        )
+
+    def _grid_indexes(self, indexes):
+        '''
+        Return the (row, col) position in blocks grid of
+        the blocks specified in indexes argument.
+        '''
+        indexes = np.asarray(indexes, dtype=np.intp)
+        if np.any((indexes < 0) | (indexes >= self.max_num_blocks())):
+            raise IndexError("There is no such block")
+
+        return np.divmod(indexes, self.blocks_in_cols)
+
+    def get_many(self, indexes):
+        '''
+        Return a copy of the blocks specified in indexes argument
+        as an array with shape (len(indexes), sblock_rows, sblock_cols).
+
+        Arguments:
+        indexes: array of block numbers
+
+        Raises an IndexError if any index is out of range.
+        '''
+        return self.as_array()[self._grid_indexes(indexes)]
+
+    def set_many(self, indexes, blocks):
+        '''
+        Replace the blocks specified in indexes argument.
+
+        Arguments:
+        indexes: array of block numbers
+        blocks: replacement blocks, an array with shape
+            (len(indexes), sblock_rows, sblock_cols)
+
+        Raises an IndexError if any index is out of range.
+        '''
+        self.as_array()[self._grid_indexes(indexes)] = blocks
+
     def __getitem__(self, num_block):
         '''
         Return the block specified in num_block argument.
@@ -0,0 +1,31 @@
+'''
+Colour space conversions
+'''
+
+import numpy as np
+
+
+# ITU-R BT.601 full range (JPEG/JFIF) RGB to YCbCr
+RGB2YCBCR = np.array([
+    [0.299, 0.587, 0.114],
+    [-0.168736, -0.331264, 0.5],
+    [0.5, -0.418688, -0.081312],
+])
+YCBCR2RGB = np.linalg.inv(RGB2YCBCR)
+YCBCR_OFFSET = np.array([0, 128, 128])
+
+
+def rgb2ycbcr(image):
+    '''
+    Return an RGB image (..., 3) converted to YCbCr (JPEG/JFIF),
+    as a float array.
+    '''
+    return np.matmul(image, RGB2YCBCR.T) + YCBCR_OFFSET
+
+
+def ycbcr2rgb(image):
+    '''
+    Return a YCbCr image (..., 3) converted to RGB, as a float array.
+    Values are not rounded or clipped.
+    '''
+    return np.matmul(image - YCBCR_OFFSET, YCBCR2RGB.T)
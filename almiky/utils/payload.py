@@ -0,0 +1,148 @@
+'''
+Payload representation as packed bits
+'''
+
+import numpy as np
+
+
+class Payload:
+    '''
+    Sequence of bits packed in a numpy array of uint8, eight bits
+    per byte (most significant bit first, as utils.char2bin does).
+
+    A payload is built from bits:
+    payload = Payload.from_bits('0110')
+    payload = Payload.from_bits([0, 1, 1, 0])
+
+    from bytes or text:
+    payload = Payload.from_bytes(b'almiky')
+    payload = Payload.from_text('díaz', encoding='utf-8')
+
+    and converted back losslessly:
+    payload.bits() => array([0, 1, 1, 0], dtype=uint8)
+    payload.to_bytes() => b'almiky'
+    payload.to_text() => 'díaz'
+
+    Payloads behave as bit sequences: len(payload), payload[i],
+    iteration, np.asarray(payload) and str(payload) ('0110').
+    '''
+
+    def __init__(self, packed, length=None):
+        '''
+        Initialize self. See help(type(self)) for accurate signature.
+
+        Arguments:
+        packed -- bytes or uint8 array of packed bits
+        length -- number of bits (default is 8 bits per byte)
+        '''
+        self.packed = np.frombuffer(bytes(packed), dtype=np.uint8)
+        if length is None:
+            length = self.packed.size * 8
+        if not 0 <= length <= self.packed.size * 8:
+            raise ValueError('Invalid payload length')
+        self.length = length
+
+    @classmethod
+    def from_bits(cls, bits):
+        '''
+        Return a payload from a bit sequence: an str of '0' and '1'
+        characters, an iterable of 0 and 1 values or a payload.
+        '''
+        bits = as_bits(bits)
+        return cls(np.packbits(bits), len(bits))
+
+    @classmethod
+    def from_bytes(cls, data):
+        '''
+        Return a payload from bytes
+        '''
+        return cls(data)
+
+    @classmethod
+    def from_text(cls, text, encoding='utf-8'):
+        '''
+        Return a payload from text. With latin-1 encoding bits
+        are the same of utils.char2bin.
+        '''
+        return cls(text.encode(encoding))
+
+    def bits(self):
+        '''
+        Return bits as an array of uint8 (values 0 or 1)
+        '''
+        return np.unpackbits(self.packed, count=self.length)
+
+    def to_bytes(self):
+        '''
+        Return payload as bytes, last byte is padded with zeros
+        '''
+        return self.packed.tobytes()
+
+    def to_text(self, encoding='utf-8'):
+        '''
+        Return payload decoded as text
+        '''
+        return self.to_bytes().decode(encoding)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            # A single bit is read without unpacking the payload
+            if not -self.length <= index < self.length:
+                raise IndexError('payload index out of range')
+            index %= self.length
+            return np.uint8(self.packed[index >> 3] >> (7 - (index & 7)) & 1)
+
+        return self.bits()[index]
+
+    def __iter__(self):
+        return iter(self.bits())
+
+    def __array__(self, dtype=None, copy=None):
+        bits = self.bits()
+        return bits if dtype is None else bits.astype(dtype)
+
+    def __eq__(self, other):
+        if not isinstance(other, Payload):
+            return NotImplemented
+        return (
+            self.length == other.length and
+            np.array_equal(self.bits(), other.bits())
+        )
+
+    def __str__(self):
+        return (self.bits() + ord('0')).tobytes().decode('ascii')
+
+    def __repr__(self):
+        return 'Payload({!r})'.format(str(self))
+
+
+def as_bits(data):
+    '''
+    Return a bit sequence as an array of uint8 (values 0 or 1).
+    Raise ValueError if data is not a valid bit sequence.
+
+    Arguments:
+    data -- payload, str of '0' and '1' characters or
+        iterable of 0 and 1 values
+    '''
+    if isinstance(data, Payload):
+        return data.bits()
+
+    if isinstance(data, str):
+        try:
+            bits = np.frombuffer(data.encode('ascii'), dtype=np.uint8)
+        except UnicodeEncodeError as e:
+            raise ValueError('Invalid binary data') from e
+        bits = bits - ord('0')
+    else:
+        bits = np.asarray(data)
+        if bits.dtype == object or bits.dtype.kind not in 'biuf':
+            raise ValueError('Invalid binary data')
+
+    if np.any((bits != 0) & (bits != 1)):
+        raise ValueError('Invalid binary data')
+
+    return bits.astype(np.uint8).reshape(-1)
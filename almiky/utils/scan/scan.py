@@ -1,6 +1,8 @@
 '''Methods for scanning'''
 
 
+import numpy as np
+
 from .maps import ROW_MAJOR_8x8
 
 
@@ -114,6 +116,12 @@ class ScanMapping:
     data as argument.
     scanning = scan(data)
 
+    The map is compiled once into a flat index array, so coefficients
+    of a stack of blocks with shape (..., N, N) are selected or modified
+    at once:
+    coefficients = scan.gather(blocks, index=slice(1, 9))
+    scan.scatter(blocks, coefficients, index=slice(1, 9))
+
     See help(ScanMapper) for more details
     '''
     def __init__(self, map=ROW_MAJOR_8x8):
@@ -124,6 +132,8 @@ class ScanMapping:
         map -- map used for scanning
         '''
         self.map = map
+        self.positions = np.asarray(map, dtype=np.intp)
+        self.positions.flags.writeable = False
 
     def __call__(self, data):
         '''
@@ -133,3 +143,50 @@ class ScanMapping:
         data -- data to scan: (NxN) numpy array
         '''
         return ScanMapper(data, self.map)
+
+    def _get_indexes(self, shape, index):
+        '''
+        Return rows and columns of map indexes in blocks
+
+        Arguments:
+        shape -- blocks shape
+        index -- map indexes: int, slice or array of int
+        '''
+        try:
+            positions = self.positions[index]
+        except IndexError as e:
+            raise IndexError('scan index out of range') from e
+
+        length = shape[-1]
+        x, y = np.divmod(positions, length)
+
+        if np.any(x >= length):
+            raise IndexError('block indexes out of range')
+
+        return x, y
+
+    def gather(self, blocks, index=slice(None)):
+        '''
+        Return coefficients of blocks in map order, with shape (..., k)
+        where k is the number of map indexes
+
+        Arguments:
+        blocks -- (..., N, N) numpy array
+        index -- map indexes to gather: int, slice or array of int
+            (default is all map)
+        '''
+        x, y = self._get_indexes(blocks.shape, index)
+        return blocks[..., x, y]
+
+    def scatter(self, blocks, values, index=slice(None)):
+        '''
+        Set coefficients of blocks in map order. Blocks are modified
+        in place (it can be a view, see help(BlocksImage.as_array)).
+
+        Arguments:
+        blocks -- (..., N, N) numpy array
+        values -- coefficients, broadcastable to (..., k) shape
+        index -- map indexes to set (default is all map)
+        '''
+        x, y = self._get_indexes(blocks.shape, index)
+        blocks[..., x, y] = values
@@ -259,3 +259,72 @@ class BlockImageTest(TestCase):
         block[0][0] = 0.40426582
 
         np.testing.assert_array_equal(blocks[0], new_block)
+
+    def test_as_array(self):
+        image = np.arange(48.).reshape(6, 8)
+        blocks = BlocksImage(image, 2, 4)
+
+        grid = blocks.as_array()
+
+        self.assertEqual(grid.shape, (3, 2, 2, 4))
+        for index, block in enumerate(blocks):
+            np.testing.assert_array_equal(grid[index // 2, index % 2], block)
+
+    def test_as_array_is_a_view(self):
+        image = np.zeros((4, 4))
+        blocks = BlocksImage(image, 2, 2)
+
+        grid = blocks.as_array()
+        grid[1, 0] = [[1, 2], [3, 4]]
+
+        np.testing.assert_array_equal(blocks[2], [[1, 2], [3, 4]])
+        np.testing.assert_array_equal(image[2:, :2], [[1, 2], [3, 4]])
+
+    def test_as_array_incomplete_blocks(self):
+        '''
+        Rows and columns out of complete blocks are excluded.
+        '''
+        image = np.arange(35.).reshape(5, 7)
+        blocks = BlocksImage(image, 2, 2)
+
+        grid = blocks.as_array()
+
+        self.assertEqual(grid.shape, (2, 3, 2, 2))
+        np.testing.assert_array_equal(grid[1, 2], blocks[5])
+
+    def test_get_many(self):
+        image = np.arange(64.).reshape(8, 8)
+        blocks = BlocksImage(image, 2, 2)
+
+        stack = blocks.get_many([0, 9, 15])
+
+        np.testing.assert_array_equal(
+            stack, [blocks[0], blocks[9], blocks[15]])
+
+        # A copy is returned
+        stack[0] = -1
+        np.testing.assert_array_equal(blocks[0], [[0, 1], [8, 9]])
+
+    def test_set_many(self):
+        image = np.arange(64.).reshape(8, 8)
+        expected = np.copy(image)
+        expected[4:6, 2:4] = -1
+        expected[6:8, 6:8] = -2
+        blocks = BlocksImage(image, 2, 2)
+
+        blocks.set_many([9, 15], np.array([
+            np.full((2, 2), -1),
+            np.full((2, 2), -2),
+        ]))
+
+        np.testing.assert_array_equal(image, expected)
+
+    def test_many_out_of_range(self):
+        image = np.arange(64.).reshape(8, 8)
+        blocks = BlocksImage(image, 2, 2)
+
+        with self.assertRaises(IndexError, msg="There is no such block"):
+            blocks.get_many([0, 16])
+
+        with self.assertRaises(IndexError, msg="There is no such block"):
+            blocks.set_many([-1], np.zeros((1, 2, 2)))
@@ -0,0 +1,32 @@
+'''
+Tests for colour space conversions
+'''
+
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from almiky.utils import color
+
+
+class YCbCrTest(TestCase):
+
+    def test_conversion(self):
+        image = np.array([[[255, 0, 0], [255, 255, 255], [0, 0, 0]]])
+        expected = np.array([
+            [[76.245, 84.97232, 255.5], [255, 128, 128], [0, 128, 128]]
+        ])
+
+        np.testing.assert_array_almost_equal(
+            color.rgb2ycbcr(image), expected, 4)
+
+    def test_inverse(self):
+        image = np.random.randint(0, 256, (5, 4, 3))
+
+        np.testing.assert_array_almost_equal(
+            color.ycbcr2rgb(color.rgb2ycbcr(image)), image)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+'''
+Tests for payload module
+'''
+
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from almiky.utils import utils
+from almiky.utils.payload import Payload, as_bits
+
+
+class PayloadTest(TestCase):
+
+    def test_from_bits(self):
+        payload = Payload.from_bits('0110100111')
+
+        self.assertEqual(len(payload), 10)
+        self.assertEqual(payload.packed.nbytes, 2)
+        self.assertEqual(str(payload), '0110100111')
+        np.testing.assert_array_equal(
+            payload.bits(), [0, 1, 1, 0, 1, 0, 0, 1, 1, 1])
+        self.assertEqual(payload, Payload.from_bits(payload.bits()))
+
+    def test_bytes(self):
+        data = bytes(range(256))
+
+        payload = Payload.from_bytes(data)
+
+        self.assertEqual(len(payload), 2048)
+        self.assertEqual(payload.to_bytes(), data)
+
+    def test_text(self):
+        msg = 'díaz núñez ∑'
+
+        self.assertEqual(Payload.from_text(msg).to_text(), msg)
+
+    def test_char2bin_compatible(self):
+        msg = 'díaz núñez'
+
+        payload = Payload.from_text(msg, encoding='latin-1')
+
+        self.assertEqual(str(payload), utils.char2bin(msg))
+        self.assertEqual(utils.bin2char(str(payload)), msg)
+
+    def test_sequence(self):
+        payload = Payload.from_bits([1, 0, 1])
+
+        self.assertEqual(payload[0], 1)
+        self.assertEqual(payload[-2], 0)
+        np.testing.assert_array_equal(payload[1:], [0, 1])
+        with self.assertRaises(IndexError):
+            payload[3]
+        self.assertEqual(list(payload), [1, 0, 1])
+        np.testing.assert_array_equal(np.asarray(payload), [1, 0, 1])
+
+    def test_invalid_length(self):
+        with self.assertRaises(ValueError):
+            Payload(b'a', 9)
+
+
+class AsBitsTest(TestCase):
+
+    def test_conversion(self):
+        expected = [1, 0, 1, 1]
+
+        for data in ('1011', [1, 0, 1, 1], np.array([1., 0, 1, 1]),
+                     Payload.from_bits('1011')):
+            bits = as_bits(data)
+            self.assertEqual(bits.dtype, np.uint8)
+            np.testing.assert_array_equal(bits, expected)
+
+    def test_invalid_data(self):
+        for data in ('10a1', '1021', 'ñ', [0, 2], ['0', '1']):
+            with self.assertRaises(ValueError):
+                as_bits(data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -200,3 +200,60 @@ class MappingScanTest(TestCase):
         scanning[24] = 8
 
         self.assertEqual(block[3, 3], 8)
+
+
+class BlockStackScanTest(TestCase):
+    '''
+    Test scanning a stack of blocks at once
+    '''
+
+    def test_gather(self):
+        blocks = np.random.rand(5, 8, 8)
+
+        scan = ScanMapping(map=maps.ZIGZAG_8x8)
+        coefficients = scan.gather(blocks)
+
+        self.assertEqual(coefficients.shape, (5, 64))
+        np.testing.assert_array_equal(
+            coefficients[2], list(scan(blocks[2])))
+
+    def test_gather_indexes(self):
+        blocks = np.random.rand(5, 8, 8)
+
+        scan = ScanMapping(map=maps.ZIGZAG_8x8)
+        coefficients = scan.gather(blocks, index=slice(1, 9))
+
+        self.assertEqual(coefficients.shape, (5, 8))
+        self.assertEqual(coefficients[4, 2], scan(blocks[4])[3])
+        np.testing.assert_array_equal(
+            scan.gather(blocks, index=18), [
+                scan(block)[18] for block in blocks])
+
+    def test_scatter(self):
+        blocks = np.random.rand(5, 8, 8)
+        expected = blocks.copy()
+        values = np.random.rand(5, 3)
+
+        scan = ScanMapping(map=maps.ZIGZAG_8x8)
+        scan.scatter(blocks, values, index=[1, 2, 3])
+
+        for block, coefficients in zip(expected, values):
+            scanning = scan(block)
+            for index, value in zip([1, 2, 3], coefficients):
+                scanning[index] = value
+
+        np.testing.assert_array_equal(blocks, expected)
+
+    def test_index_out_range(self):
+        blocks = np.random.rand(5, 4, 4)
+
+        scan = ScanMapping()
+
+        with self.assertRaises(IndexError, msg='scan index out of range'):
+            scan.gather(np.random.rand(5, 8, 8), index=64)
+
+        with self.assertRaises(IndexError, msg='block index out of range'):
+            scan.gather(blocks, index=63)
+
+        with self.assertRaises(IndexError, msg='block index out of range'):
+            scan.scatter(blocks, 8, index=63)
@@ -5,6 +5,8 @@ Tests for utility module
 import unittest
 from unittest import TestCase
 
+import numpy as np
+
 from almiky.utils import utils
 
 
@@ -45,5 +47,31 @@ class MaxPSNRTest(TestCase):
         self.assertAlmostEqual(value, expected)
 
 
+class ZigZagScanTest(TestCase):
+    def test_scan(self):
+        block = np.arange(64).reshape(8, 8)
+
+        np.testing.assert_array_equal(
+            utils.vzig_zag_scan(block), utils.matrix_zig_zag().reshape(-1))
+
+    def test_inverse_scan(self):
+        block = np.random.rand(8, 8)
+
+        np.testing.assert_array_equal(
+            utils.mzig_zag_scan(utils.vzig_zag_scan(block)), block)
+        np.testing.assert_array_equal(
+            utils.inv_vzig_zag_scan(block), utils.vzig_zag_scan(block.T))
+
+    def test_stack_of_blocks(self):
+        blocks = np.random.rand(5, 8, 8)
+
+        vectors = utils.vzig_zag_scan(blocks)
+
+        self.assertEqual(vectors.shape, (5, 64))
+        np.testing.assert_array_equal(
+            vectors[3], utils.vzig_zag_scan(blocks[3]))
+        np.testing.assert_array_equal(utils.mzig_zag_scan(vectors), blocks)
+
+
 if __name__ == '__main__':
     unittest.main()
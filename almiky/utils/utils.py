@@ -4,6 +4,8 @@ import math
 
 import numpy as np
 
+from almiky.utils.scan import maps
+
 
 def blake2b_bin(key):
     hexa_data = hashlib.blake2b(key.encode('utf-8')).hexdigest()
@@ -11,6 +13,8 @@ def blake2b_bin(key):
 
 
 def replace(byte_init, bit):
+    # Bits can be given as '0'/'1' characters or 0/1 numbers
+    bit = str(int(bit))
     if bit == '0':
         if byte_init % 2 == 0:
             byte_fin = byte_init
@@ -111,37 +115,42 @@ def lsb(byte):
 
 
 def matrix_zig_zag():
-    A = np.array([
-        [0,    1,     8,    16,     9,     2,     3,    10],
-        [17,    24,    32,    25,    18,    11,     4,     5],
-        [12,    19,    26,    33,    40,    48,    41,    34],
-        [27,    20,    13,     6,     7,    14,    21,    28],
-        [35,    42,    49,    56,    57,    50,    43,    36],
-        [29,    22,    15,    23,    30,    37,    44,    51],
-        [58,    59,    52,    45,    38,    31,    39,    46],
-        [53,    60,    61,    54,    47,    55,    62,    63]])
-    return A
+    return ZIG_ZAG.reshape(8, 8).copy()
+
+
+# Zig-zag scan order of an 8x8 block: i-th scanned coefficient is
+# block.reshape(-1)[ZIG_ZAG[i]]
+ZIG_ZAG = np.array(maps.ZIGZAG_8x8)
+ZIG_ZAG.flags.writeable = False
+
+# Inverse permutation: block.reshape(-1) == vector[INV_ZIG_ZAG]
+INV_ZIG_ZAG = np.argsort(ZIG_ZAG)
+INV_ZIG_ZAG.flags.writeable = False
 
 
 def vzig_zag_scan(A):
-    L = []
-    pos = matrix_zig_zag().reshape(-1)
-    seq = A.reshape(-1)
-    for i in range(len(pos)):
-        L.append(seq[pos[i]])
-    return L
+    '''
+    vzig_zag_scan(A) => np.array, return coefficients of 8x8 block
+    in zig-zag order. (A) can be a stack of blocks with shape (..., 8, 8),
+    then result shape is (..., 64).
+    '''
+    A = np.asarray(A)
+    return A.reshape(A.shape[:-2] + (64,))[..., ZIG_ZAG]
 
 
 def inv_vzig_zag_scan(A):
-    return vzig_zag_scan(A.T)
+    return vzig_zag_scan(np.swapaxes(A, -1, -2))
 
 
 def mzig_zag_scan(vect):
-    L = np.zeros(len(vect))
-    pos = vzig_zag_scan(np.array(range(64)).reshape(8, 8))
-    for i in range(len(pos)):
-        L[int(pos[i])] = vect[i]
-    return L.reshape(8, 8)
+    '''
+    mzig_zag_scan(vect) => np.array, return 8x8 block from
+    coefficients in zig-zag order, inverse of vzig_zag_scan.
+    (vect) can be a stack of vectors with shape (..., 64), then result
+    shape is (..., 8, 8).
+    '''
+    vect = np.asarray(vect, dtype=float)
+    return vect[..., INV_ZIG_ZAG].reshape(vect.shape[:-1] + (8, 8))
 
 
 def max_psnr(dimensions, max=255):
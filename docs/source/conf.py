@@ -16,8 +16,9 @@ from unittest import mock
 
 sys.path.insert(0, os.path.abspath('../..'))
 MOCK_MODULES = [
-    'numpy', 'scipy', 'matplotlib', 'matplotlib.pyplot', 'mpmath',
-    'scipy.interpolate', 'cv2', 'scipy.spatial', 'imageio']
+    'numpy', 'numpy.lib', 'numpy.lib.recfunctions', 'scipy', 'matplotlib',
+    'matplotlib.pyplot', 'mpmath', 'scipy.interpolate', 'scipy.spatial',
+    'imageio']
 
 for mod_name in MOCK_MODULES:
     sys.modules[mod_name] = mock.Mock()
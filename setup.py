@@ -15,5 +15,10 @@ setup(
         'mpmath==1.3.0',
         'imageio==2.28.1',
     ],
+    entry_points={
+        'console_scripts': [
+            'almiky-embed=almiky.hiders.scripts.embed:main',
+        ],
+    },
     zip_safe=False
 )